@@ -32,16 +32,38 @@ SETTINGS_FILENAME = PLUGIN_NAME + '.sublime-settings'
 
 INIT_DELAY = 4000	# initialization delay (for ST2), in msec
 
-MODELINE_RE = r'.*-\*-\s*(.+?)\s*-\*-.*'
-
 DEFAULT_MODELINE_REGION = 'top'     # 'top', 'bottom', 'both'
 DEFAULT_MODELINE_REGION_SIZE = 5 	# lines
+DEFAULT_MODELINE_REGION_BYTES = 0 	# characters (maximum text fetched per region; 0 == no limit)
+TAIL_SEARCH_CHUNK_SIZE = 4096 		# characters (initial bottom region search chunk; doubled for each further chunk)
+DEFAULT_MODELINE_FORMATS = [ 'emacs', 'vim', 'shebang' ]
+
+MODELINE_CACHE_SIZE = 256 	# entries (modeline => compiled setting actions)
+
+DEFAULT_MODELINE_ASYNC = True 			# parse views off the UI thread (ST3+)
+DEFAULT_MODELINE_DEBOUNCE_DELAY = 50 	# msec
+DEFAULT_MODELINE_MODIFIED_DELAY = 500 	# msec (edits are re-evaluated once typing pauses for this long; < 0 == never)
+DEFAULT_MODELINE_STARTUP_SLICE = 10 	# msec (maximum thread time per queue processing slice)
+DEFAULT_MODELINE_IDLE_DELAY = 1000 		# msec (background tabs are processed once view events pause for this long; < 0 == only on activation)
+DEFAULT_MODELINE_INSTRUMENTATION = False 	# per-phase timing of view evaluation
+DEFAULT_MODELINE_LOG_LEVEL = 'notice' 		# package logging level (levels below NOTICE are only kept in the in-memory log)
+DEFAULT_MODELINE_LOG_BUFFER_SIZE = 1000 	# records
+DEFAULT_MODELINE_LARGE_FILE_SIZE = 16 * 1024 * 1024 	# characters (views at least this large are read from disk; 0 == never)
+DEFAULT_MODELINE_FILE_CACHE_SIZE = 10000 	# entries (persistent file parse results; 0 == disabled)
+
+## view processing priorities (lower values are processed first)
+PRIORITY_ACTIVE = 0 		# view shown in the focused group
+PRIORITY_VISIBLE = 1 		# view shown in another group (or window)
+PRIORITY_BACKGROUND = 2 	# hidden tab (deferred until activated, or until the editor is idle)
+PRIORITY_NAMES = { PRIORITY_ACTIVE: 'active', PRIORITY_VISIBLE: 'visible', PRIORITY_BACKGROUND: 'background' }
 
 ###
 
-import itertools
-import re
+import fnmatch
+import heapq
+import json
 import os
+import threading
 import time
 
 if __package__ == None:
@@ -55,6 +77,12 @@ if __package__ == None:
 	__path__.append( '.' )
 
 from .lib import common
+from .lib import engine
+from .lib import headtail
+from .lib import lru
+from .lib import scanner
+from .lib import syntaxmeta
+from .lib import timing
 
 #common.DEBUG = True
 
@@ -72,11 +100,10 @@ if common.DEBUG:
 else:
 	log.setLevel( logging.NOTICE )          # [ 1, STUDY/TRACE, DEBUG, INFO, NOTICE, DESIGN, WARNING, ERROR, CRITICAL ]
 
+from .lib import persist
 from .lib import sublime
 import sublime_plugin
 
-log.setLevel( logging.INFO )          # [ 1, STUDY/TRACE, DEBUG, INFO, NOTICE, DESIGN, WARNING, ERROR, CRITICAL ]
-
 ###
 
 ST_V3 = 3000
@@ -108,6 +135,7 @@ class Preferences:
 	else:
 		settings_base_filename = 'Base File.sublime-settings'
 	settings_base = None
+	parse_config = None 	# preferences which cached parse results depend on (as of the last load())
 
 	## namespace for loaded preferences
 	class Var:
@@ -148,28 +176,56 @@ class Preferences:
 		## load plugin file settings
 		cls.var.modeline_region = str( cls.settings.get( 'modeline_region', DEFAULT_MODELINE_REGION ) ).lower()
 		cls.var.modeline_region_size = int( cls.settings.get( 'modeline_region_size', DEFAULT_MODELINE_REGION_SIZE ) )
+		cls.var.modeline_region_bytes = max( 0, int( cls.settings.get( 'modeline_region_bytes', DEFAULT_MODELINE_REGION_BYTES ) ) )
+
+		cls.var.modeline_large_file_size = int( cls.settings.get( 'modeline_large_file_size', DEFAULT_MODELINE_LARGE_FILE_SIZE ) )
+		cls.var.modeline_formats = tuple( str( format ).lower() for format in cls.settings.get( 'modeline_formats', DEFAULT_MODELINE_FORMATS ) )
+		cls.var.modeline_file_cache_size = int( cls.settings.get( 'modeline_file_cache_size', DEFAULT_MODELINE_FILE_CACHE_SIZE ) )
+		cls.var.modeline_async = bool( cls.settings.get( 'modeline_async', DEFAULT_MODELINE_ASYNC ) )
+		cls.var.modeline_debounce_delay = int( cls.settings.get( 'modeline_debounce_delay', DEFAULT_MODELINE_DEBOUNCE_DELAY ) )
+		cls.var.modeline_modified_delay = int( cls.settings.get( 'modeline_modified_delay', DEFAULT_MODELINE_MODIFIED_DELAY ) )
+		cls.var.modeline_startup_slice = int( cls.settings.get( 'modeline_startup_slice', DEFAULT_MODELINE_STARTUP_SLICE ) )
+		cls.var.modeline_idle_delay = int( cls.settings.get( 'modeline_idle_delay', DEFAULT_MODELINE_IDLE_DELAY ) )
+		cls.var.modeline_instrumentation = bool( cls.settings.get( 'modeline_instrumentation', DEFAULT_MODELINE_INSTRUMENTATION ) )
+		timing.enabled = cls.var.modeline_instrumentation
+		cls.var.modeline_log_level = logging.level_from_name( cls.settings.get( 'modeline_log_level', DEFAULT_MODELINE_LOG_LEVEL ) )
+		cls.var.modeline_log_buffer_size = int( cls.settings.get( 'modeline_log_buffer_size', DEFAULT_MODELINE_LOG_BUFFER_SIZE ) )
+		if not common.DEBUG:
+			log.setLevel( cls.var.modeline_log_level )
+		logging.ring_buffer().set_capacity( cls.var.modeline_log_buffer_size )
 
 		cls.log.debug( 'modeline_region = %s', cls.var.modeline_region )
 		cls.log.debug( 'modeline_region_size = %d', cls.var.modeline_region_size )
-
-		## load known modes from available syntax files (*.tmLanguage and *.sublime-syntax)
-		cls.var.modes = {}
-		syntax_file_patterns = [ '*.tmLanguage', '*.sublime-syntax' ]
-		syntax_files = itertools.chain.from_iterable( sublime.find_resources( pattern ) for pattern in syntax_file_patterns )
-		for syntax_file in syntax_files:
-			mode = os.path.splitext( os.path.basename( syntax_file ) )[0].lower()
-			cls.var.modes[mode] = syntax_file
-			cls.log.trace( "%s [@ %s]", mode, syntax_file )
-		### load mode maps
+		cls.log.debug( 'modeline_region_bytes = %d', cls.var.modeline_region_bytes )
+		cls.log.debug( 'modeline_large_file_size = %d', cls.var.modeline_large_file_size )
+		cls.log.debug( 'modeline_file_cache_size = %d', cls.var.modeline_file_cache_size )
+		cls.log.debug( 'modeline_formats = %s', cls.var.modeline_formats )
+		cls.log.debug( 'modeline_async = %s', cls.var.modeline_async )
+		cls.log.debug( 'modeline_debounce_delay = %d', cls.var.modeline_debounce_delay )
+		cls.log.debug( 'modeline_modified_delay = %d', cls.var.modeline_modified_delay )
+		cls.log.debug( 'modeline_startup_slice = %d', cls.var.modeline_startup_slice )
+		cls.log.debug( 'modeline_idle_delay = %d', cls.var.modeline_idle_delay )
+		cls.log.debug( 'modeline_instrumentation = %s', cls.var.modeline_instrumentation )
+		cls.log.debug( 'modeline_log_level = %s', cls.var.modeline_log_level )
+		cls.log.debug( 'modeline_log_buffer_size = %d', cls.var.modeline_log_buffer_size )
+
+		## known modes (syntax index + mode map aliases)
+		## NOTE: the syntax index is built lazily (on first mode lookup), keeping the resource scan off the startup path
 		mode_map_keys = [ 'mode_map_default', 'mode_map' ]
-		for mode_map_key in mode_map_keys:
-			if cls.settings.has( mode_map_key ):
-				for alias, mode in cls.settings.get( mode_map_key ).items():
-					alias = alias.lower()
-					mode = mode.lower()
-					if mode in cls.var.modes:
-						cls.log.trace( 'modes[%s] => modes[%s]', alias, mode )
-						cls.var.modes[alias] = cls.var.modes[mode]
+		cls.var.mode_maps = [ cls.settings.get( key ) for key in mode_map_keys if cls.settings.has( key ) ]
+
+		# cached parse results (and applied settings) may depend on prior preferences
+		## NOTE: load() also runs for every change to the base preferences (eg, 'font_size'), so caches are only discarded when
+		##   preferences which affect parsing or mode resolution have changed
+		file_cache_config = engine.file_cache_config( cls.var.modeline_region, cls.var.modeline_region_size, cls.var.modeline_formats, cls.var.modeline_region_bytes )
+		parse_config = [ file_cache_config, cls.var.modeline_large_file_size, cls.var.mode_maps ]
+		if parse_config != cls.parse_config:
+			if ( cls.parse_config is None ) or ( cls.var.mode_maps != cls.parse_config[2] ):
+				SyntaxIndex.invalidate()
+			ModelineCache.clear()
+			cls.parse_config = parse_config
+		if [ cls.var.modeline_file_cache_size, file_cache_config ] != [ FileModelineCache.maxsize, FileModelineCache.config ]:
+			FileModelineCache.configure( cls.var.modeline_file_cache_size, file_cache_config )
 
 		cls.is_loaded = True
 		cls.log.debug( '.end' )
@@ -177,18 +233,161 @@ class Preferences:
 
 ###
 
+## syntax mode index
+## * maps modes to syntax resources (*.tmLanguage and *.sublime-syntax): lowercase syntax file basenames, plus aliases
+##   from each syntax file's name, scope, and file extensions (see lib.syntaxmeta), plus mode map aliases, each also as an
+##   emacs-style '<mode>-mode' alias; mode lookups are a single dict access
+## * the syntax layer is cached (in memory and on disk) keyed by a fingerprint of the syntax resources and their file
+##   stamps (see sublime.resources_fingerprint()), so it is only rescanned when a syntax file is added, removed, or changed
+##   (including in a package subdirectory, or between sessions); syntax file metadata is cached per file, so a rescan only
+##   re-reads changed syntax files. The alias layer is rebuilt separately (mode map changes don't rescan syntaxes)
+## * the index is built lazily, on first use via get_modes(), and then reused until invalidate()'d
+
+class SyntaxIndex:
+	log = logging.getLogger( '.'.join(( __name__, 'SyntaxIndex' )) )
+	log.debug( '.begin' )
+	CACHE_FILENAME = 'syntax-index.json'
+	METADATA_CACHE_FILENAME = 'syntax-metadata.json' 	# (only read when syntaxes are rescanned)
+	CACHE_VERSION = 2
+	syntax_file_patterns = [ '*.tmLanguage', '*.sublime-syntax' ]
+	fingerprint = None
+	syntax_modes = {} 	# { mode: syntax_file } (see syntaxmeta.alias_table())
+	metadata = {} 		# { syntax_file: [ stamp, metadata ] } (see sublime.resource_stamps(), syntaxmeta.syntax_metadata())
+	mode_maps = None 	# mode maps used for the current alias layer
+	modes = {} 			# syntax_modes + mode map aliases (+ '<mode>-mode' aliases)
+	is_current = False
+	is_stale = False 	# a syntax file has been saved (forces a rescan, whatever the fingerprint)
+	lock = threading.Lock() 	# guards (re)building (lookups may occur on both the main and async threads)
+
+	@classmethod
+	def invalidate ( cls ):
+		cls.is_current = False
+
+	@classmethod
+	def invalidate_file ( cls, path ):
+		# rebuild on next use if path is a (saved) syntax file; only changed syntax files are re-read
+		if path and any( fnmatch.fnmatch( os.path.basename( path ), pattern ) for pattern in cls.syntax_file_patterns ):
+			cls.is_stale = True
+			cls.is_current = False
+
+	@classmethod
+	def get_modes ( cls ):
+		# { mode: syntax_file }; (re)builds the index if needed
+		if not cls.is_current:
+			with cls.lock:
+				if not cls.is_current:
+					cls.load( Preferences.var.mode_maps )
+					cls.is_current = True
+		return cls.modes
+
+	@classmethod
+	def load ( cls, mode_maps ):
+		cls.log.debug( '.begin' )
+		syntax_files = list( sublime.find_resources_any( cls.syntax_file_patterns ) )
+		stamps = sublime.resource_stamps( syntax_files )
+		fingerprint = sublime.resources_fingerprint( syntax_files, stamps )
+		if cls.is_stale or ( fingerprint != cls.fingerprint ):
+			cls.load_syntax_modes( fingerprint, cls.is_stale, syntax_files, stamps )
+			cls.is_stale = False
+			cls.mode_maps = None
+		if mode_maps != cls.mode_maps:
+			cls.load_aliases( mode_maps )
+		return cls.modes
+
+	@classmethod
+	def cache_file ( cls ):
+		return os.path.join( sublime.package_cache_path(), cls.CACHE_FILENAME )
+
+	@classmethod
+	def metadata_cache_file ( cls ):
+		return os.path.join( sublime.package_cache_path(), cls.METADATA_CACHE_FILENAME )
+
+	@classmethod
+	def load_syntax_modes ( cls, fingerprint, rescan=False, syntax_files=None, stamps=None ):
+		cache = persist.load_json( cls.cache_file(), {} )
+		if not rescan and ( cache.get( 'version' ) == cls.CACHE_VERSION ) and ( cache.get( 'fingerprint' ) == fingerprint ):
+			cls.log.debug( 'syntax index loaded from cache' )
+			cls.syntax_modes = cache['modes']
+		else:
+			if not cls.metadata:
+				cache = persist.load_json( cls.metadata_cache_file(), {} )
+				if cache.get( 'version' ) == cls.CACHE_VERSION:
+					cls.metadata = cache['metadata']
+			cls.syntax_modes = cls.scan_syntax_modes( syntax_files, stamps )
+			try:
+				persist.save_json( cls.metadata_cache_file(), { 'version': cls.CACHE_VERSION, 'metadata': cls.metadata } )
+				persist.save_json( cls.cache_file(), { 'version': cls.CACHE_VERSION, 'fingerprint': fingerprint, 'modes': cls.syntax_modes } )
+			except ( IOError, OSError ) as e:
+				cls.log.warning( 'unable to save syntax index cache (%s)', e )
+		cls.fingerprint = fingerprint
+
+	@classmethod
+	def scan_syntax_modes ( cls, syntax_files=None, stamps=None ):
+		# { mode: syntax_file }, from syntax file names and contents (syntax_files/stamps == the syntax resources and their
+		#   sublime.resource_stamps(), if already known)
+		# NOTE: each syntax file is read only if its stamp (file/archive size and mtime) has changed
+		cls.log.debug( 'scanning syntax resources' )
+		if syntax_files is None:
+			syntax_files = list( sublime.find_resources_any( cls.syntax_file_patterns ) )
+		if stamps is None:
+			stamps = sublime.resource_stamps( syntax_files )
+		metadata = {}
+		changed = []
+		for syntax_file in syntax_files:
+			entry = cls.metadata.get( syntax_file )
+			if ( entry is not None ) and ( stamps[syntax_file] is not None ) and ( entry[0] == stamps[syntax_file] ):
+				metadata[syntax_file] = entry
+			else:
+				changed.append( syntax_file )
+		threads = syntaxmeta.IPC_PARSE_THREADS if sublime.is_load_resource_ipc() else None 	# (a thread pool is only faster when reads block)
+		for ( syntax_file, m ) in syntaxmeta.parse_resources( changed, sublime.load_resource, threads ).items():
+			metadata[syntax_file] = [ stamps[syntax_file], m ]
+		cls.log.debug( '%d syntax file(s); %d read', len( syntax_files ), len( changed ) )
+		cls.metadata = metadata
+		return syntaxmeta.alias_table( [ ( syntax_file, metadata[syntax_file][1] ) for syntax_file in syntax_files ] )
 
-def to_json_type ( v ):
-	# log.debug( '.begin' )
-	# from "https://github.com/SublimeText/Modelines/blob/master/sublime_modelines.py"
-	""""Convert string value to proper JSON type.
-	"""
-	if v.lower() in ('true', 'false'):
-		v = v[0].upper() + v[1:].lower()
-	try:
-		return eval(v, {}, {})
-	except:
-		raise ValueError("Could not convert to JSON type.")
+	@classmethod
+	def load_aliases ( cls, mode_maps ):
+		modes = dict( cls.syntax_modes )
+		for mode_map in mode_maps:
+			for alias, mode in mode_map.items():
+				alias = alias.lower()
+				mode = mode.lower()
+				if mode in modes:
+					cls.log.trace( 'modes[%s] => modes[%s]', alias, mode )
+					modes[alias] = modes[mode]
+		cls.modes = syntaxmeta.mode_aliases( modes )
+		cls.mode_maps = [ dict( mode_map ) for mode_map in mode_maps ]
+
+###
+
+_now = getattr( time, 'perf_counter', time.time ) 	# monotonic, high resolution clock (when available)
+
+def is_valid_view ( view ):
+	# NOTE: view.is_valid() is not available in ST2
+	is_valid = getattr( view, 'is_valid', None )
+	return ( is_valid is None ) or is_valid()
+
+def buffer_views ( view ):
+	# [ view, clone, ... ] == all open views of the buffer shown in view (eg, via "File > New View into File")
+	# NOTE: clones share the buffer (text, change_count(), line endings), but each has its own view settings
+	buffer_id = view.buffer_id()
+	views = [ view ]
+	for window in sublime.windows():
+		views.extend( v for v in window.views() if ( v.buffer_id() == buffer_id ) and ( v.id() != view.id() ) )
+	return views
+
+def buffer_view_map ( ):
+	# { view.buffer_id(): [ view, clone, ... ], ... } for all open views
+	view_map = {}
+	for window in sublime.windows():
+		for v in window.views():
+			view_map.setdefault( v.buffer_id(), [] ).append( v )
+	return view_map
+
+def region_fingerprint ( spans ):
+	# fingerprint of modeline region text; independent of region positions (which shift with edits elsewhere in the view)
+	return hash( tuple( ( begin == 0, text ) for ( begin, text ) in spans ) )
 
 ###
 
@@ -209,140 +408,799 @@ class ModelineListener(sublime_plugin.EventListener):
 	def on_activated( self, view ):
 		# NOTE: ST2, on_activated() is triggered for all loaded views upon initial startup; ST3,
 		self.log.debug( '.begin' )
-		ModelineWorker.eval_view( view )
+		ModelineWorker.eval_view( view, priority=PRIORITY_ACTIVE )
 
 	def on_load( self, view ):
 		self.log.debug( '.begin' )
+		ModelineCache.evict( view )
 		ModelineWorker.eval_view( view )
 
 	def on_post_save( self, view ):
 		self.log.debug( '.begin' )
+		if view.file_name():
+			sublime.invalidate_resource_catalog( view.file_name() )
+			SyntaxIndex.invalidate_file( view.file_name() )
 		ModelineWorker.eval_view( view )
 
+	def on_modified_async( self, view ):
+		# (ST3+) re-evaluate after edits; keystroke bursts are coalesced, and views are only re-scanned if the text of the
+		#   modeline regions changed (see ModelineCache)
+		if Preferences.is_loaded and ( Preferences.var.modeline_modified_delay >= 0 ) and not view.is_loading():
+			ModelineWorker.eval_view( view, Preferences.var.modeline_modified_delay )
+
+	def on_close( self, view ):
+		self.log.debug( '.begin' )
+		views = buffer_views( view )
+		if len( views ) > 1:
+			# other views of the buffer remain open; pending work and cached results are shared with them
+			ModelineWorker.discard( view, views[1] )
+			ModelineCache.release( view )
+			return
+		ModelineWorker.discard( view )
+		ModelineCache.evict( view )
+
+###
+
+## per-buffer parse result cache
+## * keyed by view.buffer_id() (clone views share a buffer, so a buffer is parsed once for all of its views); an entry is
+##   valid only while view.change_count() is unchanged
+## * entries hold the parsed modelines or None (ie, negative caching of "no modeline here")
+## * entries also hold a fingerprint of the modeline region text; after edits which leave the region text unchanged (eg,
+##   typing in the middle of the view), the entry is revalidated without re-scanning
+## * entries also record the views to which the result has been applied (view settings are per-view, so a clone opened
+##   later still needs the settings, but views which already have them aren't rewritten)
+
+class ModelineCache:
+	log = logging.getLogger( '.'.join(( __name__, 'ModelineCache' )) )
+	log.debug( '.begin' )
+	entries = {} 		# view.buffer_id() => ( change_count, modelines, fingerprint, set( applied view.id(), ... ) )
+	hits = 0
+	misses = 0
+	region_hits = 0 	# (revalidated by fingerprint)
+
+	@classmethod
+	def is_current ( cls, view ):
+		# True if the cached result for view is still valid (view buffer unchanged since last parse)
+		entry = cls.entries.get( view.buffer_id() )
+		if ( entry is not None ) and ( entry[0] == view.change_count() ):
+			cls.hits += 1
+			return True
+		cls.misses += 1
+		return False
+
+	@classmethod
+	def revalidate ( cls, view, fingerprint ):
+		# True (and the entry is marked current) if the modeline region text of view is unchanged since last parse
+		entry = cls.entries.get( view.buffer_id() )
+		if ( entry is None ) or ( entry[2] is None ) or ( entry[2] != fingerprint ):
+			return False
+		cls.region_hits += 1
+		if not view.is_loading():
+			cls.entries[view.buffer_id()] = ( view.change_count(), entry[1], fingerprint, entry[3] )
+		return True
+
+	@classmethod
+	def store ( cls, view, modelines, fingerprint=None, views=() ):
+		# views == views to which the result is (about to be) applied
+		if view.is_loading():
+			# content not yet available (and change_count() may not change when loading completes)
+			return
+		cls.entries[view.buffer_id()] = ( view.change_count(), modelines, fingerprint, set( v.id() for v in views ) )
+
+	@classmethod
+	def is_applied ( cls, view ):
+		# True if the cached result for view's buffer has already been applied to view
+		entry = cls.entries.get( view.buffer_id() )
+		return ( entry is not None ) and ( view.id() in entry[3] )
+
+	@classmethod
+	def claim ( cls, view, views ):
+		# ( modelines, [ view, ... ] ) == cached result for view's buffer, and those of views to which it has not yet been
+		#   applied (which are then recorded as applied)
+		entry = cls.entries.get( view.buffer_id() )
+		if entry is None:
+			return ( None, [] )
+		applied = entry[3]
+		views = [ v for v in views if v.id() not in applied ]
+		applied.update( v.id() for v in views )
+		return ( entry[1], views )
+
+	@classmethod
+	def release ( cls, view ):
+		# forget view (closed), keeping the entry for the remaining views of its buffer
+		entry = cls.entries.get( view.buffer_id() )
+		if entry is not None:
+			entry[3].discard( view.id() )
+
+	@classmethod
+	def evict ( cls, view ):
+		cls.entries.pop( view.buffer_id(), None )
+		cls.log.debug( 'view (id:%s; buffer:%s) evicted; %s', str( view.id() ), str( view.buffer_id() ), cls.stats() )
+
+	@classmethod
+	def clear ( cls ):
+		cls.entries.clear()
+
+	@classmethod
+	def stats ( cls ):
+		return { 'entries': len( cls.entries ), 'hits': cls.hits, 'misses': cls.misses, 'region_hits': cls.region_hits }
+
+###
+
+## persistent (cross-session) parse result cache
+## * keyed by absolute file path; an entry is valid only while the file ( size, mtime ) is unchanged, and is only used for
+##   views holding the unmodified file content (so a hit needs no buffer access at all)
+## * entries hold the parsed modelines or None (ie, negative caching of "no modeline here")
+## * bounded (LRU eviction); loaded on first use, and saved (atomically; see lib.persist) shortly after changes and on unload
+## * entries are discarded when preferences which affect parsing (region, region size, formats) change
+
+class FileModelineCache:
+	log = logging.getLogger( '.'.join(( __name__, 'FileModelineCache' )) )
+	log.debug( '.begin' )
+	CACHE_FILENAME = 'modeline-cache.json'
+	CACHE_VERSION = engine.FILE_CACHE_VERSION
+	SAVE_DELAY = 5000 		# msec
+	RACY_MTIME_WINDOW = 2 	# sec; files modified this recently aren't cached (a change may not yet be visible via mtime)
+	maxsize = DEFAULT_MODELINE_FILE_CACHE_SIZE
+	config = None 		# preferences which parse results depend on
+	entries = lru.LRUCache( DEFAULT_MODELINE_FILE_CACHE_SIZE ) 	# path => ( size, mtime, modelines )
+	is_loaded = False
+	is_changed = False 	# (unsaved changes)
+	is_save_pending = False
+	hits = 0
+	misses = 0
+	lock = threading.Lock() 	# guards entries and state (lookups occur on both the main and async threads)
+
+	@classmethod
+	def cache_file ( cls ):
+		return os.path.join( sublime.package_cache_path(), cls.CACHE_FILENAME )
+
+	@classmethod
+	def configure ( cls, maxsize, config ):
+		with cls.lock:
+			if cls.is_loaded and ( config == cls.config ):
+				cls.resize( maxsize, cls.entries.items() )
+			else:
+				cls.resize( maxsize, [] )
+				cls.is_changed = cls.is_loaded
+			cls.maxsize = maxsize
+			cls.config = config
+		cls.schedule_save()
+
+	@classmethod
+	def resize ( cls, maxsize, items ):
+		entries = lru.LRUCache( max( maxsize, 1 ) )
+		for ( key, value ) in items[ -entries.maxsize: ]:
+			entries.put( key, value )
+		cls.entries = entries
+
+	@classmethod
+	def load ( cls ):
+		# (lock held) load saved entries, if saved with the current configuration
+		if cls.is_loaded: return
+		cls.is_loaded = True
+		t = timing.clock()
+		cache = persist.load_json( cls.cache_file(), {} )
+		if ( cache.get( 'version' ) == cls.CACHE_VERSION ) and ( cache.get( 'config' ) == cls.config ):
+			items = []
+			for ( path, size, mtime, modelines ) in cache.get( 'entries', [] ):
+				if modelines is not None:
+					modelines = tuple( tuple( modeline ) for modeline in modelines )
+				items.append( ( path, ( size, mtime, modelines ) ) )
+			cls.resize( cls.maxsize, items )
+		timing.record( 'file_cache_load', t )
+		cls.log.debug( '%d entries loaded', len( cls.entries ) )
+
+	@classmethod
+	def key ( cls, view ):
+		# ( path, size, mtime ) of the file held (unmodified) by view, or None (not cacheable)
+		if ( cls.maxsize <= 0 ) or view.is_loading() or view.is_dirty():
+			return None
+		path = view.file_name()
+		if not path:
+			return None
+		try: st = os.stat( path )
+		except OSError: return None
+		return ( os.path.abspath( path ), st.st_size, st.st_mtime )
+
+	@classmethod
+	def lookup ( cls, key ):
+		# ( True, modelines ) if cached; otherwise ( False, None )
+		( path, size, mtime ) = key
+		with cls.lock:
+			cls.load()
+			entry = cls.entries.get( path )
+			if ( entry is not None ) and ( entry[0] == size ) and ( entry[1] == mtime ):
+				cls.hits += 1
+				return ( True, entry[2] )
+			cls.misses += 1
+		return ( False, None )
+
+	@classmethod
+	def store ( cls, key, modelines ):
+		( path, size, mtime ) = key
+		if mtime > ( time.time() - cls.RACY_MTIME_WINDOW ):
+			return
+		with cls.lock:
+			cls.load()
+			cls.entries.put( path, ( size, mtime, modelines ) )
+			cls.is_changed = True
+		cls.schedule_save()
+
+	@classmethod
+	def schedule_save ( cls ):
+		with cls.lock:
+			if ( not cls.is_changed ) or cls.is_save_pending: return
+			cls.is_save_pending = True
+		getattr( sublime, 'set_timeout_async', sublime.set_timeout )( cls.save, cls.SAVE_DELAY )
+
+	@classmethod
+	def save ( cls ):
+		with cls.lock:
+			cls.is_save_pending = False
+			if not cls.is_changed: return
+			cls.is_changed = False
+			entries = [ [ path, size, mtime, modelines ] for ( path, ( size, mtime, modelines ) ) in cls.entries.items() ]
+			config = cls.config
+		t = timing.clock()
+		try:
+			persist.save_json( cls.cache_file(), { 'version': cls.CACHE_VERSION, 'config': config, 'entries': entries } )
+		except ( IOError, OSError ) as e:
+			cls.log.warning( 'unable to save modeline cache (%s)', e )
+		timing.record( 'file_cache_save', t )
+
+	@classmethod
+	def stats ( cls ):
+		lookups = cls.hits + cls.misses
+		return { 'entries': len( cls.entries ), 'maxsize': cls.maxsize, 'hits': cls.hits, 'misses': cls.misses, 'hit_rate': ( cls.hits / lookups ) if lookups else 0.0 }
+
+###
+
+def statistics ( ):
+	# aggregate plugin statistics (phase timings, cache and write counters)
+	return {
+		'phases': timing.summary(),
+		'view_cache': ModelineCache.stats(),
+		'file_cache': FileModelineCache.stats(),
+		'compiled_modelines': ModelineWorker.compiled_modelines.stats(),
+		'literal_memo': engine.literal_memo.stats(),
+		'settings_writes': { 'written': ModelineWorker.writes, 'skipped': ModelineWorker.skipped_writes },
+		'buffers': { 'parses': ModelineWorker.parses, 'views_applied': ModelineWorker.fanouts },
+		'queue': ModelineWorker.stats(),
+		}
+
+
+class ModelineDumpStatisticsCommand(sublime_plugin.WindowCommand):
+	# dump plugin statistics (as JSON) to a file (if `path` is given) or to a new (scratch) view
+	def run( self, path=None ):
+		text = json.dumps( statistics(), indent=4, sort_keys=True )
+		if path:
+			with open( os.path.expanduser( path ), 'w' ) as file:
+				file.write( text + '\n' )
+			sublime.status_message( '%s: statistics written to %s' % ( PLUGIN_NAME, path ) )
+		else:
+			view = self.window.new_file()
+			view.set_name( '%s statistics' % PLUGIN_NAME )
+			view.set_scratch( True )
+			view.run_command( 'append', { 'characters': text + '\n' } )
+
+
+class ModelineDumpLogCommand(sublime_plugin.WindowCommand):
+	# dump the in-memory log (recent records, formatted now) to a new (scratch) view
+	def run( self ):
+		text = '\n'.join( logging.ring_buffer().dump() )
+		view = self.window.new_file()
+		view.set_name( '%s log' % PLUGIN_NAME )
+		view.set_scratch( True )
+		view.run_command( 'append', { 'characters': text + '\n' } )
+
 ###
 
 class ModelineWorker:
 	log = logging.getLogger( '.'.join(( __name__, 'ModelineWorker' )) )
 	log.debug( '.begin' )
-	queue = {}
+	queue = {} 			# str( view.buffer_id() ) => { 'view', 'n', 'serial', 'priority', 'queued', 'due' } (clone views share an entry)
+	heap = [] 			# ( priority, serial, key ) for queued buffers; superseded items are skipped when popped
+	lock = threading.Lock() 	# guards queue (view events arrive on the main thread; async parsing runs on the ST async thread)
+	serial = 0 			# event serial number (orders and debounces queued buffers)
+	last_event = 0 		# time of the last view event (see modeline_idle_delay)
+	is_idle_scheduled = False
+	compiled_modelines = lru.LRUCache( MODELINE_CACHE_SIZE ) 	# modeline => compiled setting actions
+	writes = 0 			# count of view setting writes
+	skipped_writes = 0 	# count of view setting writes skipped (value already current)
+	parses = 0 			# count of buffer parses (one per buffer, however many clone views it has)
+	fanouts = 0 		# count of views to which a parse result was applied
+	max_depth = 0 		# maximum queue depth
+	view_map = None 	# buffer_view_map(), built on demand (at most once per processing slice)
+	startup = None 		# startup pass state: { 'keys': set( queued buffer key, ... ), 'views', 'buffers', 'start', 'busy' } (until all are processed)
+	startup_report = None 	# { 'views', 'buffers', 'msec', 'elapsed_msec' } for the completed startup pass (msec == processing time only)
+	waits = {} 			# priority => [ count, total, max ] (seconds from queueing until processing)
 
 	@classmethod
 	def begin_work ( cls ): ## ??: name not technically correct, items may already be queued for processing ... change to proceed, process_startup_queue, ...
 		cls.log.debug( '.begin' )
+		# startup: queue all open (eg, session restored) views by priority; background tabs wait for activation or idle time
+		## NOTE: ST2 fires on_activated() for all views at startup; those views are already queued
+		start = _now()
+		views = cls.startup_views()
+		for ( view, priority ) in views:
+			cls.enqueue( view, priority )
+		cls.log.info( 'startup: %d view(s) queued (%d visible)', len( views ), len([ v for ( v, priority ) in views if priority < PRIORITY_BACKGROUND ]) )
+		with cls.lock:
+			keys = set( cls.queue )
+			cls.startup = { 'keys': keys, 'views': len( views ), 'buffers': len( keys ), 'start': start, 'busy': 0.0 }
+			if not keys:
+				cls.startup_done()
 		if len( cls.queue ) > 0:
-			# queue'd work to do
-			cls.eval_view( None ) 	# trigger view processing
+			cls.schedule( 0 )
+			cls.schedule_idle()
 
 	@classmethod
-	def eval_view ( cls, view ):
+	def startup_views ( cls ):
+		# [ ( view, priority ), ... ] for all open views
+		active_window = sublime.active_window()
+		visible = []
+		background = []
+		for window in sublime.windows():
+			is_active_window = ( active_window is not None ) and ( window.id() == active_window.id() )
+			active_group = window.active_group()
+			visible_ids = set()
+			for group in range( window.num_groups() ):
+				view = window.active_view_in_group( group )
+				if view is not None:
+					visible_ids.add( view.id() )
+					visible.append( ( view, PRIORITY_ACTIVE if ( is_active_window and group == active_group ) else PRIORITY_VISIBLE ) )
+			background.extend( ( view, PRIORITY_BACKGROUND ) for view in window.views() if view.id() not in visible_ids )
+		return visible + background
+
+	@classmethod
+	def priority ( cls, view ):
+		# PRIORITY_ACTIVE (shown in the focused group), PRIORITY_VISIBLE (shown in another group/window), or
+		#   PRIORITY_BACKGROUND (a hidden tab) for view's buffer
+		buffer_id = view.buffer_id()
+		active_window = sublime.active_window()
+		priority = PRIORITY_BACKGROUND
+		for window in sublime.windows():
+			is_active_window = ( active_window is not None ) and ( window.id() == active_window.id() )
+			for group in range( window.num_groups() ):
+				v = window.active_view_in_group( group )
+				if ( v is not None ) and ( v.buffer_id() == buffer_id ):
+					if is_active_window and ( group == window.active_group() ):
+						return PRIORITY_ACTIVE
+					priority = PRIORITY_VISIBLE
+		if ( priority == PRIORITY_BACKGROUND ) and ( view.window() is None ):
+			# not a tab (eg, a panel or a view still being opened); not deferred
+			priority = PRIORITY_VISIBLE
+		return priority
+
+	@classmethod
+	def is_async ( cls ):
+		# async (off UI thread) operation is only possible for ST3+
+		return Preferences.var.modeline_async and hasattr( sublime, 'set_timeout_async' )
+
+	@classmethod
+	def eval_view ( cls, view, delay=None, priority=None ):
+		# delay == debounce delay (msec); default == modeline_debounce_delay (async operation), or none (synchronous)
+		# priority == PRIORITY_* for view (default == determined from the view's placement)
 		cls.log.debug( '.begin' )
 
+		# fully initialized?
+		if not Preferences.is_loaded:
+			# initialization not complete
+			if view is not None:
+				cls.enqueue( view, cls.priority( view ) if priority is None else priority )
+				cls.log.debug( "view (id:%s) queued for later processing", str( view.id() ) )
+			return
+
+		if delay is None:
+			delay = Preferences.var.modeline_debounce_delay if cls.is_async() else 0
+
 		# queue view for processing
 		if view is not None:
-			key = str( view.id() )
-			n = 1
-			if key in cls.queue: n = cls.queue[key]['n'] + 1
-			cls.queue[key] = { 'view': view, 'n': n }
-			cls.log.debug( "cls.queue[%s][n] = %d", key, cls.queue[key]['n'] )
+			if priority is None: priority = cls.priority( view )
+			priority = cls.enqueue( view, priority, delay )
+			cls.last_event = _now()
 
 		if len( cls.queue ) == 0:
 			cls.log.warning( "no views to parse (i.e., eval_view( None ) called with empty view queue)" )
 			return
 
-		# fully initialized?
-		if not Preferences.is_loaded:
-			# initialization not complete
-			cls.log.debug( "view (id:%s) queued for later processing", str( view.id() ) )
+		if ( view is not None ) and ( priority >= PRIORITY_BACKGROUND ):
+			# deferred until the view is activated (or the editor is idle)
+			cls.schedule_idle()
+		elif cls.is_async() or ( delay > 0 ):
+			# debounce: parse (on the async thread, if available) after the debounce delay; later events for the same buffer
+			#   postpone it
+			cls.schedule( delay )
+		else:
+			cls.run_queue()
+
+	@classmethod
+	def enqueue ( cls, view, priority, delay=0 ):
+		# queue (or re-queue) view's buffer; a queued buffer keeps its highest priority and original queue time
+		# returns the buffer's (queued) priority
+		key = str( view.buffer_id() )
+		now = _now()
+		with cls.lock:
+			cls.serial += 1
+			val = cls.queue.get( key )
+			if val is None:
+				val = cls.queue[key] = { 'n': 0, 'priority': priority, 'queued': now }
+				cls.max_depth = max( cls.max_depth, len( cls.queue ) )
+			val['view'] = view
+			val['n'] += 1
+			val['serial'] = cls.serial
+			val['priority'] = min( val['priority'], priority )
+			val['due'] = now + delay / 1000.0
+			heapq.heappush( cls.heap, ( val['priority'], val['serial'], key ) )
+		cls.log.debug( "cls.queue[%s][n] = %d (priority %d)", key, val['n'], val['priority'] )
+		return val['priority']
+
+	@classmethod
+	def discard ( cls, view, successor=None ):
+		# remove any pending (queued) work for view; or, with successor (another view of the same buffer), hand it over
+		key = str( view.buffer_id() )
+		with cls.lock:
+			if successor is None:
+				cls.queue.pop( key, None )
+				cls.startup_done( key )
+			elif ( key in cls.queue ) and ( cls.queue[key]['view'].id() == view.id() ):
+				cls.queue[key]['view'] = successor
+
+	@classmethod
+	def startup_done ( cls, key=None, busy=0.0 ):
+		# record a buffer queued at startup as processed (taking busy seconds) or discarded; once all have been (including
+		#   deferred background buffers), the startup pass is reported; cls.lock must be held
+		# NOTE: the elapsed time includes the idle wait before background buffers are processed, so the summed processing
+		#   time is reported as the startup cost
+		state = cls.startup
+		if state is None:
+			return
+		if key in state['keys']:
+			state['keys'].discard( key )
+			state['busy'] += busy
+		if state['keys']:
 			return
+		cls.startup = None
+		cls.startup_report = { 'views': state['views'], 'buffers': state['buffers'], 'msec': state['busy'] * 1000, 'elapsed_msec': ( _now() - state['start'] ) * 1000 }
+		cls.log.info( 'startup: %d view(s) (%d buffer(s)) processed in %.1f msec (%.1f msec elapsed)', state['views'], state['buffers'], cls.startup_report['msec'], cls.startup_report['elapsed_msec'] )
 
-		while len( cls.queue ) > 0:
-			(key, val) = cls.queue.popitem()
-			cls.log.debug( "parsing view (id:%s)", key )
-			view = val['view']
-			# log.trace( "view.settings().get('syntax') = %s", view.settings().get('syntax') )
-			modeline_match = cls.match_modeline( view )
-			if modeline_match is not None:
-				cls.eval_modeline( view, modeline_match )
+	@classmethod
+	def schedule ( cls, delay=0, background=False ):
+		set_timeout = sublime.set_timeout_async if cls.is_async() else sublime.set_timeout
+		set_timeout( lambda: cls.run_queue( background ), int( delay ) )
+
+	@classmethod
+	def schedule_idle ( cls, delay=None ):
+		# process background buffers once no view events have occurred for modeline_idle_delay
+		if delay is None:
+			delay = Preferences.var.modeline_idle_delay
+		if ( delay < 0 ) or cls.is_idle_scheduled:
+			return
+		cls.is_idle_scheduled = True
+		cls.schedule( delay, True )
+
+	@classmethod
+	def run_queue ( cls, background=False ):
+		# process due queued buffers, highest priority (then least recently queued) first, for at most one processing slice
+		#   (further slices are scheduled, yielding between slices); background buffers are only processed when idle
+		# NOTE: the queue is re-examined for each buffer, so a newly activated view is processed next
+		if background:
+			cls.is_idle_scheduled = False
+			idle_remaining = cls.last_event + Preferences.var.modeline_idle_delay / 1000.0 - _now()
+			if idle_remaining > 0:
+				cls.schedule_idle( idle_remaining * 1000 )
+				return
+		deadline = _now() + Preferences.var.modeline_startup_slice / 1000.0
+		cls.view_map = None
+		try:
+			while True:
+				with cls.lock:
+					( item, next_due ) = cls.next_item( background )
+				if item is None:
+					break
+				cls.eval_queued_view( *item )
+				if _now() >= deadline:
+					cls.schedule( 0, background )
+					return
+		finally:
+			cls.view_map = None
+		if next_due is not None:
+			# (timers may fire slightly early)
+			cls.schedule( max( 0, ( next_due - _now() ) * 1000 ), background )
+		if not background and ( len( cls.queue ) > 0 ):
+			cls.schedule_idle()
+
+	@classmethod
+	def next_item ( cls, background=False ):
+		# ( ( key, val ), next_due ) for the next due queued buffer (removed from the queue), or ( None, next_due ) if none;
+		#   next_due == earliest due time of any buffer still within its debounce delay (or None); cls.lock must be held
+		now = _now()
+		pending = []
+		item = None
+		next_due = None
+		while cls.heap:
+			( priority, serial, key ) = cls.heap[0]
+			val = cls.queue.get( key )
+			if ( val is None ) or ( val['serial'] != serial ):
+				# superseded by a later event (or already processed)
+				heapq.heappop( cls.heap )
+				continue
+			if ( priority >= PRIORITY_BACKGROUND ) and not background:
+				break
+			heapq.heappop( cls.heap )
+			if val['due'] > now:
+				# still within its debounce delay (a run is already scheduled for it)
+				pending.append( ( priority, serial, key ) )
+				next_due = val['due'] if next_due is None else min( next_due, val['due'] )
+				continue
+			del cls.queue[key]
+			item = ( key, val )
+			break
+		for entry in pending:
+			heapq.heappush( cls.heap, entry )
+		return ( item, next_due )
+
+	@classmethod
+	def eval_queued_view ( cls, key, val ):
+		# parse a queued buffer (on the async thread, if available); view settings are applied on the main thread
+		wait = _now() - val['queued']
+		stats = cls.waits.setdefault( val['priority'], [ 0, 0.0, 0.0 ] )
+		stats[0] += 1
+		stats[1] += wait
+		stats[2] = max( stats[2], wait )
+		start = _now()
+		try:
+			if not is_valid_view( val['view'] ):
+				return
+			result = cls.parse_view( key, val )
+			if result is not None:
+				if cls.is_async():
+					sublime.set_timeout( lambda: cls.apply_to_views( *result ), 0 )
+				else:
+					cls.apply_to_views( *result )
+		finally:
+			if cls.startup is not None:
+				with cls.lock:
+					cls.startup_done( key, _now() - start )
+
+	@classmethod
+	def stats ( cls ):
+		waits = {}
+		for ( priority, ( count, total, maximum ) ) in cls.waits.items():
+			waits[PRIORITY_NAMES[priority]] = { 'count': count, 'mean': total / count if count else 0.0, 'max': maximum }
+		startup = cls.startup_report
+		if cls.startup is not None:
+			startup = { 'pending': len( cls.startup['keys'] ), 'buffers': cls.startup['buffers'] }
+		return { 'depth': len( cls.queue ), 'max_depth': cls.max_depth, 'waits': waits, 'startup': startup }
+
+	@classmethod
+	def parse_view ( cls, key, val ):
+		# returns ( ( settings, line_endings ), [ view, ... ] ) for a queued view, or None if no (changed) modeline is present
+		#   or all views of the buffer already have the settings
+		# * the buffer is parsed once; the result applies to all of its (clone) views
+		cls.log.debug( "parsing buffer (id:%s; %d event(s) coalesced)", key, val['n'] )
+		view = val['view']
+		if ModelineCache.is_current( view ):
+			cls.log.debug( "buffer (id:%s) unchanged; cached result is current", key )
+			return cls.cached_result( view )
+		# log.trace( "view.settings().get('syntax') = %s", view.settings().get('syntax') )
+		t = timing.clock()
+		## unmodified file views may be resolved from the persistent cache (without reading the view buffer)
+		file_key = FileModelineCache.key( view )
+		( is_cached, modelines ) = FileModelineCache.lookup( file_key ) if file_key is not None else ( False, None )
+		fingerprint = None
+		if not is_cached:
+			spans = cls.modeline_spans( view )
+			fingerprint = region_fingerprint( spans )
+			if ModelineCache.revalidate( view, fingerprint ):
+				cls.log.debug( "buffer (id:%s) modeline regions unchanged; cached result is current", key )
+				timing.record( 'parse_view', t )
+				return cls.cached_result( view )
+			modelines = engine.find_modelines( spans, Preferences.var.modeline_formats )
+			if file_key is not None:
+				FileModelineCache.store( file_key, modelines )
+		cls.parses += 1
+		result = None
+		if modelines is None:
+			ModelineCache.store( view, modelines, fingerprint, [ view ] ) 	# (nothing to apply; clones needn't be enumerated)
+		else:
+			views = cls.buffer_views( view )
+			ModelineCache.store( view, modelines, fingerprint, views )
+			result = ( cls.modeline_settings( modelines ), views )
+		timing.record( 'parse_view', t )
+		return result
+
+	@classmethod
+	def cached_result ( cls, view ):
+		# parse_view() result for views (of an unchanged buffer) which haven't yet had the cached result applied (eg, a newly
+		#   opened clone view); None if there are none
+		# NOTE: if view itself already has the result, its clones are not enumerated (a clone opened later is queued itself)
+		if ModelineCache.is_applied( view ):
+			return None
+		( modelines, views ) = ModelineCache.claim( view, cls.buffer_views( view ) )
+		if ( modelines is None ) or not views:
+			return None
+		return ( cls.modeline_settings( modelines ), views )
+
+	@classmethod
+	def buffer_views ( cls, view ):
+		# buffer_views( view ), using a map of all open views built at most once per processing slice (rather than a scan of
+		#   all open views per buffer)
+		if cls.view_map is None:
+			cls.view_map = buffer_view_map()
+		return [ view ] + [ v for v in cls.view_map.get( view.buffer_id(), () ) if v.id() != view.id() ]
 
 	@classmethod
 	def match_modeline ( cls, view ):
 		cls.log.debug( '.begin' )
 		# cls.log.trace( "view.settings().get('syntax') = %s", view.settings().get('syntax') )
+		# check for modelines (all enabled formats) within designated spans
+		return engine.find_modelines( cls.modeline_spans( view ), Preferences.var.modeline_formats )
 
-		pref = Preferences.var
+	@classmethod
+	def modeline_spans ( cls, view ):
+		# [ ( begin, text ), ... ] for the possible modeline locations within view
+		## NOTE: large, unmodified file views are read directly from disk
+		spans = None
+		if cls.is_large_file( view ):
+			spans = cls.file_spans( view )
+		if spans is None:
+			spans = cls.view_spans( view )
+		return spans
 
-		# determine possible modeline locations within view
+	@classmethod
+	def view_spans ( cls, view ):
+		# [ ( begin, text ), ... ] for each span of the view which may hold a modeline
+		pref = Preferences.var
+		limit = pref.modeline_region_bytes
 
 		## determine regions for evaluation
-		regions = []
+		## NOTE: regions are specified as character position pairs [eg, (begin, end) ]; each is limited to `limit` characters
+		t = timing.clock()
+		view_size = view.size()
+		head = None
+		tail = None
 		if ( pref.modeline_region != 'bottom' ):
 			# 'both' or 'top'
-			region_end = view.text_point( pref.modeline_region_size, 0 )
-			region = sublime.Region( 0, region_end )
-			# log.design( 'top.region = %s', region )
-			regions.append( region )
+			## NOTE: through the end of line N (0-based; ie, N + 1 lines), as for the view.lines() regions used previously
+			region_end = view.line( view.text_point( pref.modeline_region_size, 0 ) ).end()
+			if limit > 0: region_end = min( region_end, limit )
+			head = ( 0, region_end )
 		if ( pref.modeline_region != 'top' ):
 			# 'both' or 'bottom'
-			eof_row = view.rowcol( view.size() )[0]
-			region_start = view.text_point( eof_row - pref.modeline_region_size + 1, 0 )
-			region = sublime.Region( region_start, view.size() )
-			regions.append( region )
-		## ToDO: ?? coalesce regions
-
-		## determine lines for evaluation from region list
-		## NOTE: lines are specified as character position pairs [eg, (start_pos, end_pos) ]
-		lines = []
-		for r in regions:
-			lines.extend( view.lines(r) )
-		cls.log.info( '[%s: %s] lines = %s', str(view.id()), view.file_name(), lines )
-
-		# check for a modeline within designated line set
-
-		for line in lines:
-			# find modeline (via regexp match)
-			m = re.match(MODELINE_RE, view.substr(line))
-			if m:
-				return m
-		return None
-
-	@classmethod
-	def eval_modeline ( cls, view, modeline_match ):
+			tail = cls.tail_span( view, view_size, pref.modeline_region_size, limit )
+		timing.record( 'regions', t )
+		cls.log.debug( '[%s: %s] head = %s; tail = %s', str(view.id()), view.file_name(), head, tail and ( tail[0], view_size ) )
+
+		## overlapping regions (eg, 'both' for short files) are trimmed, so no text is fetched twice
+		## NOTE: the tail begins at a line start, so modelines are never split between the spans
+		t = timing.clock()
+		spans = []
+		if head is not None:
+			if tail is not None:
+				head = ( 0, min( head[1], tail[0] ) )
+			if ( head[1] > 0 ) or ( tail is None ):
+				spans.append( ( 0, view.substr( sublime.Region( *head ) ) ) )
+		if tail is not None:
+			spans.append( tail )
+		timing.record( 'substr', t )
+		return spans
+
+	@classmethod
+	def tail_span ( cls, view, view_size, n_lines, limit=0 ):
+		# ( begin, text ) for the last n_lines lines of view (the empty "line" following a final newline counts as a line),
+		#   limited to the last `limit` characters (0 == no limit)
+		# NOTE: lines are found by searching backwards from the end in chunks (the chunks also make up the returned text);
+		#   view.rowcol( view.size() ) would require line indexing of the whole buffer. Chunk size starts small (typical lines
+		#   are short) and doubles, so very long lines take only a logarithmic number of view.substr() calls.
+		if n_lines <= 0:
+			return ( view_size, '' )
+		floor = max( 0, view_size - limit ) if limit > 0 else 0
+		chunks = []
+		newlines = 0
+		end = view_size
+		chunk_size = TAIL_SEARCH_CHUNK_SIZE
+		while end > floor:
+			begin = max( floor, end - chunk_size )
+			chunk_size *= 2
+			chunk = view.substr( sublime.Region( begin, end ) )
+			pos = len( chunk )
+			while True:
+				pos = chunk.rfind( '\n', 0, pos )
+				if pos < 0: break
+				newlines += 1
+				if newlines == n_lines:
+					chunks.append( chunk[ pos + 1 : ] )
+					return ( begin + pos + 1, ''.join( reversed( chunks ) ) )
+			chunks.append( chunk )
+			end = begin
+		return ( floor, ''.join( reversed( chunks ) ) )
+
+	@classmethod
+	def is_large_file ( cls, view ):
+		# True if view is large and holds the unmodified content of a (utf-8/ascii compatible) file
+		threshold = Preferences.var.modeline_large_file_size
+		if ( threshold <= 0 ) or ( view.size() < threshold ):
+			return False
+		if view.is_dirty() or not view.file_name():
+			return False
+		encoding = view.encoding()
+		return not ( encoding.startswith( 'UTF-16' ) or encoding.startswith( 'UTF-32' ) )
+
+	@classmethod
+	def file_spans ( cls, view ):
+		# ( begin, text ) spans read from the view's file (via memory-map; only the head/tail pages are touched), or None
+		# NOTE: avoids view.rowcol()/view.text_point() near EOF, which force line indexing of the whole buffer
 		pref = Preferences.var
+		t = timing.clock()
+		try:
+			spans = headtail.head_tail_spans( view.file_name(), pref.modeline_region, pref.modeline_region_size, pref.modeline_region_bytes or headtail.MAX_SPAN_BYTES )
+		except ( IOError, OSError, ValueError ) as e:
+			cls.log.debug( "unable to read '%s' (%s); using view content", view.file_name(), e )
+			return None
+		timing.record( 'file_spans', t )
+		cls.log.debug( '[%s: %s] file spans = %s', str(view.id()), view.file_name(), [ ( begin, len( text ) ) for ( begin, text ) in spans ] )
+		return spans
+
+	@classmethod
+	def eval_modeline ( cls, view, modelines ):
+		( settings, line_endings ) = cls.modeline_settings( modelines )
+		cls.apply_settings( view, settings, line_endings )
+
+	@classmethod
+	def modeline_settings ( cls, modelines ):
+		# determine the desired view settings for a sequence of ( format, modeline ) pairs (later modelines take precedence)
+		# returns ( settings, line_endings ); settings == { key: value }, line_endings == None if unspecified
+		( settings, line_endings, _ ) = engine.modeline_settings( modelines, cls.resolve_mode, cls.compiled_modelines )
+		return ( settings, line_endings )
 
-		modeline = modeline_match.group(1).lower() 	## ?? should lower() be used
-
-		# Split into options
-		for opt in modeline.split(';'):
-			opts = re.match('\s*(st-|sublime-text-|sublime-|sublimetext-)?(.+):\s*(.+)\s*', opt)
-
-			if opts:
-				key, value = opts.group(2), opts.group(3)
-
-				if opts.group(1):
-					# log.study( "settings().set(%s, %s)" % (key, value) )
-					view.settings().set(key, to_json_type(value))
-				elif key == "coding":
-					value = re.match('(?:.+-)?(unix|dos|mac)', value).group(1)
-					if value == "dos":
-						value = "windows"
-					if value == "mac":
-						value = "CR"
-					view.set_line_endings(value)
-				elif key == "indent-tabs-mode":
-					if value == "nil" or value.strip == "0":
-						view.settings().set('translate_tabs_to_spaces', True)
-					else:
-						view.settings().set('translate_tabs_to_spaces', False)
-				elif key == "mode":
-					if value in pref.modes:
-						view.settings().set('syntax', pref.modes[value])
-				elif key == "tab-width":
-					view.settings().set('tab_size', int(value))
+	@classmethod
+	def resolve_mode ( cls, mode ):
+		return SyntaxIndex.get_modes().get( mode )
+
+	@classmethod
+	def apply_to_views ( cls, modeline_settings, views ):
+		# apply modeline settings to each (still open) view of a buffer
+		for view in views:
+			if is_valid_view( view ):
+				cls.fanouts += 1
+				cls.apply_settings( view, *modeline_settings )
+
+	@classmethod
+	def apply_settings ( cls, view, settings, line_endings=None ):
+		# apply only those settings which differ from the current view values
+		# NOTE: each write triggers settings change callbacks for every listening plugin, so unneeded writes are skipped
+		# NOTE: a changed syntax is applied first, and then all other modeline settings are written (not compared); current
+		#   values may come from the prior syntax's settings, and unwritten keys would take the new syntax's values
+		t = timing.clock()
+		writes = 0
+		skipped = 0
+		view_settings = view.settings()
+		syntax = settings.get( 'syntax' )
+		is_new_syntax = ( syntax is not None ) and ( view_settings.get( 'syntax' ) != syntax )
+		if is_new_syntax:
+			view_settings.set( 'syntax', syntax )
+			writes += 1
+		for key, value in settings.items():
+			if key == 'syntax':
+				if not is_new_syntax: skipped += 1
+			elif not is_new_syntax and ( view_settings.get( key ) == value ):
+				skipped += 1
 			else:
-				# Not a 'key: value'-pair - assume it's a syntax-name
-				if opt.strip() in pref.modes:
-					view.settings().set('syntax', modes[opt.strip()])
-		# EOFN
+				view_settings.set( key, value )
+				writes += 1
+		if line_endings is not None:
+			if view.line_endings().lower() == line_endings.lower():
+				skipped += 1
+			else:
+				view.set_line_endings( line_endings )
+				writes += 1
+		cls.writes += writes
+		cls.skipped_writes += skipped
+		timing.record( 'apply_settings', t )
+		cls.log.debug( "view (id:%s): %d setting(s) written, %d unchanged (skipped)", str( view.id() ), writes, skipped )
+		return ( writes, skipped )
 
 ###
 
@@ -407,6 +1265,11 @@ def plugin_loaded ( ):
 	sublime.set_timeout( init, delay )
 
 
+def plugin_unloaded ( ):
+	log.debug( '.begin' )
+	FileModelineCache.save()
+
+
 if sublime.version() and ( int( sublime.version() ) < ST_V3 ):
 	# ST2: explicitly call the same initialization code as used by ST3
 	log.info( '(ST2) call plugin_loaded() function' ) # .or. sys._getframe().f_code.co_name
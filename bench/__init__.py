@@ -0,0 +1,31 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench
+# headless benchmarks (run from the package root directory; eg, `python -m bench.bench_scanner`)
+# NOTE: bench/stubs holds stand-in `sublime` and `sublime_plugin` modules, so the plugin can be loaded outside of ST
+#   (the stand-in `sublime.View` holds in-memory text and counts view API calls)
+# * bench.bench_scenarios == full scenario matrix, with machine-readable (JSON) results
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import importlib
+import os
+import sys
+import types
+
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+STUBS = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), 'stubs' )
+
+PACKAGE_NAME = 'Modeline'
+
+def load_plugin ( ):
+	# import the plugin (as `Modeline.Modeline`, similar to ST3) using the stand-in sublime modules
+	if STUBS not in sys.path:
+		sys.path.insert( 0, STUBS )
+	if PACKAGE_NAME not in sys.modules:
+		package = types.ModuleType( PACKAGE_NAME )
+		package.__path__ = [ ROOT ]
+		sys.modules[PACKAGE_NAME] = package
+	plugin = importlib.import_module( PACKAGE_NAME + '.Modeline' )
+	plugin.log.setLevel( plugin.logging.WARNING ) 	# quiet (benchmark output only)
+	return plugin
@@ -0,0 +1,53 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_cli
+# time a whole-tree scan with the headless CLI (lib.cli) over a synthetic source tree, by worker process count
+# usage: python -m bench.bench_cli [--files N] [--jobs N,...] [--dir DIR]  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from lib import cli
+
+FILES_PER_DIR = 100
+HEADERS = [ '# -*- mode: python; tab-width: 4; -*-\n', '#!/usr/bin/env bash\n', '// vim: set ts=2 et :\n', '' ]
+BODY = ''.join( 'line %d of some source text, with no modeline in it\n' % i for i in range( 40 ) )
+
+def make_tree ( root, n_files ):
+	for i in range( n_files ):
+		directory = os.path.join( root, 'd%03d' % ( i // ( FILES_PER_DIR * 100 ) ), 'd%03d' % ( ( i // FILES_PER_DIR ) % 100 ) )
+		if i % FILES_PER_DIR == 0:
+			os.makedirs( directory )
+		with open( os.path.join( directory, 'f%06d.txt' % i ), 'w' ) as file:
+			file.write( HEADERS[i % len( HEADERS )] + BODY )
+
+def main ( ):
+	parser = argparse.ArgumentParser()
+	parser.add_argument( '--files', type=int, default=100000 )
+	parser.add_argument( '--jobs', default=','.join( str( n ) for n in sorted( set([ 1, multiprocessing.cpu_count() ]) ) ) )
+	parser.add_argument( '--dir', default=None, help='directory for the generated tree (default: system temporary directory)' )
+	args = parser.parse_args()
+
+	root = tempfile.mkdtemp( prefix='modeline-bench-', dir=args.dir )
+	try:
+		t = time.time()
+		make_tree( os.path.join( root, 'tree' ), args.files )
+		print( '%d files generated in %.1f sec' % ( args.files, time.time() - t ) )
+		for jobs in [ int( n ) for n in args.jobs.split( ',' ) ]:
+			t = time.time()
+			cli.main([ '--jobs', str( jobs ), '--output', os.path.join( root, 'out.jsonl' ), os.path.join( root, 'tree' ) ])
+			elapsed = time.time() - t
+			print( '%-12s %8.2f sec %10.0f files/sec' % ( 'jobs=%d' % jobs, elapsed, args.files / elapsed ) )
+			sys.stdout.flush()
+	finally:
+		shutil.rmtree( root )
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,72 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_clones
+# time the startup pass and re-activation of a 4-pane layout (each buffer open in 4 clone views), with clones sharing a
+#   buffer vs each view holding its own buffer (ie, the prior per-view work)
+# usage: python -m bench.bench_clones [N_BUFFERS]  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import sys
+import timeit
+
+from . import load_plugin
+
+N_CLONES = 4
+TEXT = '# -*- mode: python; tab-width: 4; indent-tabs-mode: nil; -*-\n' + ''.join( 'line %d of the view text\n' % i for i in range( 2000 ) ) + '# vim: set ts=4 et:\n'
+
+def main ( n_buffers=100 ):
+	Modeline = load_plugin()
+	import sublime
+	sublime.load_settings( Modeline.SETTINGS_FILENAME ).set( 'modeline_region', 'both' )
+	sublime.load_settings( Modeline.SETTINGS_FILENAME ).set( 'modeline_file_cache_size', 0 )
+	sublime.load_settings( Modeline.SETTINGS_FILENAME ).set( 'modeline_debounce_delay', 0 )
+	sublime.load_settings( Modeline.SETTINGS_FILENAME ).set( 'modeline_idle_delay', 0 )
+	Modeline.Preferences.load()
+	Worker = Modeline.ModelineWorker
+	engine = Modeline.engine
+
+	scans = [ 0 ]
+	find_modelines = engine.find_modelines
+	def counting_find_modelines ( *args, **kws ):
+		scans[0] += 1
+		return find_modelines( *args, **kws )
+	engine.find_modelines = counting_find_modelines
+
+	def layout ( shared ):
+		views = []
+		for i in range( n_buffers ):
+			buffer_id = 1000000 + i
+			views.extend( sublime.View( TEXT, buffer_id=( buffer_id if shared else None ) ) for _ in range( N_CLONES ) )
+		sublime._windows[:] = [ sublime.Window( views, num_groups=N_CLONES ) ]
+		Modeline.ModelineCache.clear()
+		return views
+
+	print( '%d buffers x %d clone views' % ( n_buffers, N_CLONES ) )
+	for ( label, shared ) in [ ( 'per view (before)', False ), ( 'per buffer (after)', True ) ]:
+		def startup ( ):
+			Worker.begin_work()
+			sublime.run_timeouts()
+		t_startup = min( timeit.repeat( startup, setup=lambda: layout( shared ), number=1, repeat=5 ) )
+		views = sublime._windows[0].views()
+		scans[0] = 0
+		writes = Worker.writes
+		sublime.reset_api_calls()
+		def activate ( ):
+			for view in views:
+				Worker.eval_view( view )
+			sublime.run_timeouts()
+		t_activate = timeit.timeit( activate, number=1 )
+		print( '%-20s startup %8.2f msec   activate all %8.2f msec   (%d scans, %d writes, %d substr calls on activation)' % ( label, t_startup * 1000, t_activate * 1000, scans[0], Worker.writes - writes, sublime.api_calls.get( 'substr', 0 ) ) )
+
+	## startup scans/writes (single pass)
+	for ( label, shared ) in [ ( 'per view (before)', False ), ( 'per buffer (after)', True ) ]:
+		layout( shared )
+		scans[0] = 0
+		writes = Worker.writes
+		Worker.begin_work()
+		sublime.run_timeouts()
+		print( '%-20s startup pass: %d scans, %d settings writes' % ( label, scans[0], Worker.writes - writes ) )
+
+if __name__ == '__main__':
+	main( *[ int( arg ) for arg in sys.argv[1:] ] )
@@ -0,0 +1,83 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_large_file
+# time modeline search of very large (default: 1 GB) files: reading/line indexing the whole file (the work needed before
+#   view.rowcol( view.size() ) can be answered) vs lib.headtail (memory-mapped head/tail) and the plugin's large file mode
+# usage: python -m bench.bench_large_file [--size MB] [--dir DIR]  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from . import load_plugin
+
+MODELINE = '# -*- mode: python; tab-width: 4; -*-\n'
+LINE = 'x' * 79 + '\n'
+
+def make_file ( path, size ):
+	block = LINE * ( ( 1 << 20 ) // len( LINE ) )
+	with open( path, 'w' ) as file:
+		file.write( MODELINE )
+		written = len( MODELINE )
+		while written < size - len( MODELINE ):
+			file.write( block )
+			written += len( block )
+		file.write( MODELINE )
+
+def index_lines ( path ):
+	# read the whole file, counting lines
+	lines = 0
+	with open( path, 'rb' ) as file:
+		while True:
+			chunk = file.read( 1 << 20 )
+			if not chunk: break
+			lines += chunk.count( b'\n' )
+	return lines
+
+def timed ( fn, repeat=3 ):
+	times = []
+	for _ in range( repeat ):
+		t = time.time()
+		result = fn()
+		times.append( time.time() - t )
+	return ( min( times ), result )
+
+def main ( ):
+	parser = argparse.ArgumentParser()
+	parser.add_argument( '--size', type=int, default=1024, help='file size (MB)' )
+	parser.add_argument( '--dir', default=None, help='directory for the generated file (default: system temporary directory)' )
+	args = parser.parse_args()
+
+	plugin = load_plugin()
+	import sublime as stub
+	plugin.Preferences.load()
+	root = tempfile.mkdtemp( prefix='modeline-bench-', dir=args.dir )
+	try:
+		path = os.path.join( root, 'large.log' )
+		make_file( path, args.size << 20 )
+		size = os.path.getsize( path )
+		print( 'file size: %d MB' % ( size >> 20 ) )
+
+		class FileView ( stub.View ):
+			# view of an unmodified file; content is never held (any line indexing view API use fails)
+			def size ( self ): return size
+			def text_point ( self, row, col ): raise AssertionError( 'view.text_point() used' )
+			def rowcol ( self, point ): raise AssertionError( 'view.rowcol() used' )
+			def substr ( self, x ): raise AssertionError( 'view.substr() used' )
+
+		view = FileView( file_name=path )
+		( t, lines ) = timed( lambda: index_lines( path ), repeat=1 )
+		print( '%-44s %12.3f msec  (%d lines)' % ( 'line index (read whole file)', t * 1e3, lines ) )
+		( t, spans ) = timed( lambda: plugin.headtail.head_tail_spans( path, 'both', 5 ) )
+		print( '%-44s %12.3f msec  (%d characters decoded)' % ( 'headtail.head_tail_spans()', t * 1e3, sum( len( text ) for ( _, text ) in spans ) ) )
+		( t, modelines ) = timed( lambda: plugin.ModelineWorker.match_modeline( view ) )
+		print( '%-44s %12.3f msec  %s' % ( 'match_modeline() (large file mode)', t * 1e3, modelines ) )
+	finally:
+		shutil.rmtree( root )
+
+if __name__ == '__main__':
+	main()
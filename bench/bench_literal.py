@@ -0,0 +1,60 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_literal
+# time conversion of typical modeline option values: eval() (prior implementation) vs lib.literal (unmemoized and memoized)
+# * first checks that emacs modeline values parse as literals (including dict values, which contain ':') and that
+#   non-literals are rejected
+# usage: python -m bench.bench_literal  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import timeit
+
+from lib import engine
+from lib import literal
+from lib import lru
+
+## emacs modeline => expected actions (non-literal values are ignored)
+CHECKS = [
+	( 'st-foo: {"a": 1}', ( ( engine.ACTION_SET, 'foo', { 'a': 1 } ), ) ),
+	( 'st-rulers: [80, 120]; st-tab_size: 2', ( ( engine.ACTION_SET, 'rulers', [ 80, 120 ] ), ( engine.ACTION_SET, 'tab_size', 2 ) ) ),
+	( 'st-foo: __import__("os")', () ),
+	( 'st-foo: 1+1', () ),
+	( 'st-foo: [x]', () ),
+	( 'st-foo: (1,2)', () ),
+	( 'st-foo: "\\x41\\u00e9\\t"', ( ( engine.ACTION_SET, 'foo', 'A\u00e9\t' ), ) ),
+	( 'st-foo: "\\q"', () ), 	# (unsupported escape)
+	]
+
+VALUES = [ 'true', 'false', '4', '80', '1.5', '"utf-8"', "'Packages/User/Monokai.tmTheme'", '[80, 120]', '{"a": 1}' ]
+
+def eval_value ( v ):
+	# prior to_json_type() implementation
+	if v.lower() in ('true', 'false'):
+		v = v[0].upper() + v[1:].lower()
+	return eval(v, {}, {})
+
+memo = lru.LRUCache( 512 )
+def memo_value ( v ):
+	value = memo.get( v, memo )
+	if value is memo:
+		value = literal.parse( v )
+		memo.put( v, value )
+	return value
+
+def check ( ):
+	for ( modeline, expected ) in CHECKS:
+		actions = engine.compile_emacs_modeline( modeline )
+		assert actions == expected, '%r: %r != %r' % ( modeline, actions, expected )
+	print( '%d modeline value checks passed' % len( CHECKS ) )
+
+def main ( ):
+	check()
+	number = 10000
+	print( 'per value (average over %d typical values)' % len( VALUES ) )
+	for ( label, fn ) in [ ( 'eval()', eval_value ), ( 'literal.parse()', literal.parse ), ( 'memoized', memo_value ) ]:
+		t = min( timeit.repeat( lambda: [ fn( v ) for v in VALUES ], number=number, repeat=3 ) ) / number / len( VALUES )
+		print( '%-20s %10.3f usec' % ( label, t * 1e6 ) )
+
+if __name__ == '__main__':
+	main()
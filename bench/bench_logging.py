@@ -0,0 +1,49 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_logging
+# time disabled and enabled log.debug() calls: prior inspect.stack() based trace points vs lib.logging
+# usage: python -m bench.bench_logging  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import inspect
+import timeit
+
+from lib import logging
+
+def _legacy_debug ( self, message=None, *args, **kws ):
+	# prior lib.logging implementation (for comparison)
+	if self.isEnabledFor( logging.DEBUG ):
+		if message is None:
+			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+		self._log( logging.DEBUG, message, args, **kws )
+
+def _legacy_wrapper ( log ):
+	# prior lib.sublime_vx wrapper trace point (stack walk happens before the level check)
+	log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+
+def _wrapper ( log ):
+	log.debug()
+
+def main ( ):
+	log = logging.getLogger( 'bench.logging' )
+	log.propagate = False
+	log.addHandler( logging.NullHandler() )
+	legacy_debug = lambda *args: _legacy_debug( log, *args )
+
+	cases = [
+		( 'debug("msg")', lambda: legacy_debug( 'message %s', 1 ), lambda: log.debug( 'message %s', 1 ) ),
+		( 'debug() trace point', lambda: legacy_debug(), lambda: log.debug() ),
+		( 'sublime_vx wrapper', lambda: _legacy_wrapper( log ), lambda: _wrapper( log ) ),
+		]
+	print( '%-24s %-9s %14s %14s' % ( 'call', 'level', 'before (usec)', 'after (usec)' ) )
+	for ( level, label ) in [ ( logging.INFO, 'disabled' ), ( logging.DEBUG, 'enabled' ) ]:
+		log.setLevel( level )
+		for ( name, before, after ) in cases:
+			number = 2000
+			t_before = min( timeit.repeat( before, number=number, repeat=3 ) ) / number
+			t_after = min( timeit.repeat( after, number=number, repeat=3 ) ) / number
+			print( '%-24s %-9s %14.3f %14.3f' % ( name, label, t_before * 1e6, t_after * 1e6 ) )
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,55 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_modified
+# time re-evaluation after edits (on_modified_async) of a 100k line view: edits in the middle of the view (modeline region
+#   text unchanged; revalidated by fingerprint), appends at the end (log growth; bottom region shifts), and modeline edits
+# usage: python -m bench.bench_modified  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import timeit
+
+from . import load_plugin
+
+N_LINES = 100000
+MODELINE = '# -*- mode: python; tab-width: 4; -*-\n'
+
+def main ( ):
+	Modeline = load_plugin()
+	import sublime
+	sublime.load_settings( Modeline.SETTINGS_FILENAME ).set( 'modeline_region', 'both' )
+	Modeline.Preferences.load()
+	Worker = Modeline.ModelineWorker
+	engine = Modeline.engine
+
+	scans = [ 0 ]
+	find_modelines = engine.find_modelines
+	def counting_find_modelines ( *args, **kws ):
+		scans[0] += 1
+		return find_modelines( *args, **kws )
+	engine.find_modelines = counting_find_modelines
+
+	lines = [ MODELINE ] + [ 'line %d of the view text\n' % i for i in range( N_LINES ) ]
+	view = sublime.View( ''.join( lines ) )
+	key = str( view.buffer_id() )
+	Worker.parse_view( key, { 'view': view, 'n': 1 } )
+
+	middle = len( lines ) // 2
+	edits = [
+		( 'edit in middle of view', lambda i: lines.__setitem__( middle, 'edited %d\n' % i ) ),
+		( 'append at end of view', lambda i: lines.append( 'appended line %d\n' % i ) ),
+		( 'edit modeline', lambda i: lines.__setitem__( 0, '# -*- mode: python; tab-width: %d; -*-\n' % ( i % 8 + 1 ) ) ),
+		]
+	number = 100
+	print( '%d line view; per re-evaluation (excluding the edit itself)' % N_LINES )
+	for ( label, edit ) in edits:
+		total = 0.0
+		scans[0] = 0
+		for i in range( number ):
+			edit( i )
+			view.set_text( ''.join( lines ) )
+			total += min( timeit.repeat( lambda: Worker.parse_view( key, { 'view': view, 'n': 1 } ), number=1, repeat=1 ) )
+		print( '%-28s %10.1f usec   (%d of %d re-evaluations scanned)' % ( label, total / number * 1e6, scans[0], number ) )
+
+if __name__ == '__main__':
+	main()
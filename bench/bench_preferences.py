@@ -0,0 +1,56 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_preferences
+# time Preferences.load() (including the syntax index build) against a synthetic catalog of syntax resources
+# usage: python -m bench.bench_preferences [N_SYNTAX_FILES]  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import sys
+import timeit
+
+from . import load_plugin
+
+def main ( n_syntax=5000 ):
+	Modeline = load_plugin()
+	import sublime
+	sublime.RESOURCES = [ 'Packages/Package%d/Syntax%d.%s' % ( i // 10, i, ( 'tmLanguage', 'sublime-syntax' )[i % 2] ) for i in range( n_syntax ) ]
+	settings = sublime.load_settings( Modeline.SETTINGS_FILENAME )
+	settings.set( 'mode_map_default', { 'alias%d' % i: 'syntax%d' % i for i in range( 0, n_syntax, 10 ) } )
+	Preferences = Modeline.Preferences
+	SyntaxIndex = Modeline.SyntaxIndex
+
+	def cold ( ):
+		# no in-memory or on-disk index (ie, full scan)
+		SyntaxIndex.fingerprint = None
+		SyntaxIndex.syntax_modes = {}
+		Modeline.persist.save_json( SyntaxIndex.cache_file(), {} )
+		Preferences.load()
+		SyntaxIndex.get_modes()
+
+	def warm_disk ( ):
+		# on-disk index only (ie, a new ST session)
+		SyntaxIndex.fingerprint = None
+		SyntaxIndex.syntax_modes = {}
+		Preferences.load()
+		SyntaxIndex.get_modes()
+
+	def warm_memory ( ):
+		# unrelated preference change (eg, a font size change in the base preferences)
+		Preferences.load()
+		SyntaxIndex.get_modes()
+
+	counter = [ 0 ]
+	def mode_map_change ( ):
+		counter[0] += 1
+		settings._values['mode_map'] = { 'user%d' % counter[0]: 'syntax1' }
+		Preferences.load()
+		SyntaxIndex.get_modes()
+
+	print( 'Preferences.load() with %d syntax files' % n_syntax )
+	for ( label, fn ) in [ ( 'cold (full scan)', cold ), ( 'warm (disk cache)', warm_disk ), ( 'warm (memory)', warm_memory ), ( 'mode_map change', mode_map_change ) ]:
+		t = min( timeit.repeat( fn, number=5, repeat=3 ) ) / 5
+		print( '%-20s %10.3f msec' % ( label, t * 1000 ) )
+
+if __name__ == '__main__':
+	main( *[ int( arg ) for arg in sys.argv[1:] ] )
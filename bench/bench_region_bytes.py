@@ -0,0 +1,59 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_region_bytes
+# per view cost of fetching the modeline regions ('both', 5 lines) by total view size and line length: prior line based
+#   regions (view.rowcol( view.size() ) + view.text_point()) vs backwards chunked tail search, without and with a
+#   modeline_region_bytes limit
+# NOTE: the stand-in view holds a prebuilt line index (so its rowcol() is cheap); in ST, rowcol() near EOF requires line
+#   indexing of the whole buffer, so the prior times shown are a lower bound
+# usage: python -m bench.bench_region_bytes  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import timeit
+
+from . import load_plugin
+
+SIZES = [ ( '1MB', 1 << 20 ), ( '10MB', 10 << 20 ), ( '100MB', 100 << 20 ) ]
+LINE_LENGTHS = [ ( '80B', 80 ), ( '100KB', 100 << 10 ), ( '2MB', 2 << 20 ) ]
+REGION_BYTES = 64 << 10
+
+def main ( ):
+	Modeline = load_plugin()
+	import sublime
+	settings = sublime.load_settings( Modeline.SETTINGS_FILENAME )
+	settings.set( 'modeline_region', 'both' )
+	Modeline.Preferences.load()
+	pref = Modeline.Preferences.var
+	Worker = Modeline.ModelineWorker
+
+	def prior_spans ( view ):
+		# prior view_spans() implementation
+		regions = [ ( 0, view.text_point( pref.modeline_region_size, 0 ) ) ]
+		view_size = view.size()
+		eof_row = view.rowcol( view_size )[0]
+		regions.append( ( view.text_point( eof_row - pref.modeline_region_size + 1, 0 ), view_size ) )
+		return [ ( begin, view.substr( sublime.Region( begin, end ) ) ) for ( begin, end ) in Modeline.scanner.coalesce_spans( regions ) ]
+
+	def run ( fn, view ):
+		fetched = sum( len( text ) for ( _, text ) in fn( view ) )
+		number = 5
+		t = min( timeit.repeat( lambda: fn( view ), number=number, repeat=3 ) ) / number
+		return ( t, fetched )
+
+	print( '%-6s %-6s | %12s %10s | %12s %10s | %12s %10s' % ( 'size', 'line', 'prior (usec)', 'fetched', 'tail (usec)', 'fetched', 'limit (usec)', 'fetched' ) )
+	for ( size_label, size ) in SIZES:
+		for ( line_label, line_length ) in LINE_LENGTHS:
+			line = 'x' * ( line_length - 1 ) + '\n'
+			view = sublime.View( line * max( 1, size // line_length ) )
+			results = []
+			results.append( run( prior_spans, view ) )
+			pref.modeline_region_bytes = 0
+			results.append( run( Worker.view_spans, view ) )
+			pref.modeline_region_bytes = REGION_BYTES
+			results.append( run( Worker.view_spans, view ) )
+			pref.modeline_region_bytes = 0
+			print( '%-6s %-6s | %s' % ( size_label, line_label, ' | '.join( '%12.1f %10d' % ( t * 1e6, fetched ) for ( t, fetched ) in results ) ) )
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,90 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_resource_scan
+# time ST2 (fallback) resource enumeration over a synthetic Packages tree on local disk: one os.walk() per pattern (prior
+#   implementation) vs lib.resources (single walk + archive central directories; cold, persisted/warm, and after a change)
+# usage: python -m bench.bench_resource_scan  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import fnmatch
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+from lib import resources
+
+N_PACKAGES = 200
+N_DIRS = 5 			# per package
+N_FILES = 20 		# per directory
+N_ARCHIVES = 50
+N_MEMBERS = 100 	# per archive
+EXTENSIONS = [ '.py', '.sublime-syntax', '.tmLanguage', '.sublime-settings', '.sublime-menu', '.tmPreferences', '.md', '.json' ]
+PATTERNS = [ '*.tmLanguage', '*.sublime-syntax' ] 	# as used for the syntax index
+
+def make_tree ( root ):
+	packages_path = os.path.join( root, 'Packages' )
+	installed_packages_path = os.path.join( root, 'Installed Packages' )
+	for p in range( N_PACKAGES ):
+		for d in range( N_DIRS ):
+			path = os.path.join( packages_path, 'Package%03d' % p, 'dir%d' % d )
+			os.makedirs( path )
+			for i in range( N_FILES ):
+				open( os.path.join( path, 'file%03d%s' % ( i, EXTENSIONS[i % len( EXTENSIONS )] ) ), 'w' ).close()
+	os.makedirs( installed_packages_path )
+	for a in range( N_ARCHIVES ):
+		archive = zipfile.ZipFile( os.path.join( installed_packages_path, 'Archive%03d.sublime-package' % a ), 'w' )
+		for i in range( N_MEMBERS ):
+			archive.writestr( 'dir%d/file%03d%s' % ( i % 4, i, EXTENSIONS[i % len( EXTENSIONS )] ), 'x' * 64 )
+		archive.close()
+	## age the tree (so directory listings are trusted; see lib.resources.RACY_MTIME_WINDOW)
+	past = time.time() - 60
+	for ( dir_path, dirs, files ) in os.walk( root ):
+		for name in dirs + files:
+			os.utime( os.path.join( dir_path, name ), ( past, past ) )
+	os.utime( root, ( past, past ) )
+	return ( packages_path, installed_packages_path )
+
+def walk_per_pattern ( packages_path ):
+	# prior ST2 find_resources() fallback, once per pattern
+	found = []
+	for pattern in PATTERNS:
+		for root, dirs, files in os.walk( packages_path ):
+			for f in files:
+				if fnmatch.fnmatch( f, pattern ):
+					found.append( os.path.relpath( os.path.join( root, f ), packages_path ) )
+	return found
+
+def timed ( fn ):
+	t = time.time()
+	result = fn()
+	return ( time.time() - t, result )
+
+def main ( ):
+	root = tempfile.mkdtemp( prefix='modeline-bench-' )
+	try:
+		( packages_path, installed_packages_path ) = make_tree( root )
+		cache_file = os.path.join( root, 'Cache', 'resource-scan.json' )
+		print( '%d packages x %d dirs x %d files (+ %d archives x %d members)' % ( N_PACKAGES, N_DIRS, N_FILES, N_ARCHIVES, N_MEMBERS ) )
+		print( '' )
+		( t, found ) = timed( lambda: walk_per_pattern( packages_path ) )
+		print( '%-48s %10.1f msec  (%d syntax files; archives not searched)' % ( 'os.walk() per pattern', t * 1e3, len( found ) ) )
+		scanner = resources.ResourceScanner( packages_path, installed_packages_path, cache_file )
+		( t, found ) = timed( scanner.scan )
+		print( '%-48s %10.1f msec  (%d resources) %s' % ( 'scan, cold', t * 1e3, len( found ), scanner.stats ) )
+		scanner = resources.ResourceScanner( packages_path, installed_packages_path, cache_file )
+		( t, found ) = timed( scanner.scan )
+		print( '%-48s %10.1f msec  %s' % ( 'scan, persisted (new session)', t * 1e3, scanner.stats ) )
+		( t, found ) = timed( scanner.scan )
+		print( '%-48s %10.1f msec  %s' % ( 'scan, warm (same session)', t * 1e3, scanner.stats ) )
+		open( os.path.join( packages_path, 'Package100', 'dir2', 'added.tmLanguage' ), 'w' ).close()
+		( t, found ) = timed( scanner.scan )
+		print( '%-48s %10.1f msec  %s' % ( 'scan, after adding a file', t * 1e3, scanner.stats ) )
+		assert 'Packages/Package100/dir2/added.tmLanguage' in found
+	finally:
+		shutil.rmtree( root )
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,62 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_resources
+# time resource lookups over a synthetic catalog of 50,000 resources: flat list scan (prior implementation) vs indexed catalog
+# usage: python -m bench.bench_resources  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import fnmatch
+import re
+import timeit
+
+from . import load_plugin
+
+N_PACKAGES = 500
+N_RESOURCES = 50000
+EXTENSIONS = [ '.py', '.sublime-syntax', '.tmLanguage', '.sublime-settings', '.sublime-menu', '.tmPreferences', '.md', '.json' ]
+
+def resources ( ):
+	per_package = N_RESOURCES // N_PACKAGES
+	return [ 'Packages/Package%03d/dir%d/file%03d%s' % ( p, i % 4, i, EXTENSIONS[i % len( EXTENSIONS )] ) for p in range( N_PACKAGES ) for i in range( per_package ) ]
+
+def scan_package_resources ( files, fnmatch_pattern, package_name ):
+	# prior find_package_resources() implementation
+	prefix = 'Packages/' + package_name
+	return [ f for f in files if f.startswith( prefix ) and fnmatch.fnmatch( f, fnmatch_pattern ) ]
+
+def scan_resources_regex ( files, regex_pattern ):
+	# prior find_resources_regex() implementation
+	regex = re.compile( regex_pattern )
+	return [ f for f in files if regex.match( f ) ]
+
+def main ( ):
+	load_plugin()
+	import sublime as stub
+	from Modeline.lib import sublime
+	files = resources()
+	stub.RESOURCES = files
+	sublime.invalidate_resource_catalog()
+
+	number = 20
+	t = min( timeit.repeat( lambda: sublime._ResourceCatalog( files ), number=1, repeat=3 ) )
+	print( '%d resources' % len( files ) )
+	print( '%-44s %10.3f msec' % ( 'catalog build', t * 1e3 ) )
+	t = min( timeit.repeat( sublime.resource_catalog, number=1000, repeat=3 ) ) / 1000
+	print( '%-44s %10.3f usec' % ( 'catalog validation (per lookup)', t * 1e6 ) )
+	print( '' )
+	print( '%-44s %12s %12s' % ( 'per lookup', 'scan (usec)', 'index (usec)' ) )
+	cases = [
+		( "package '*.sublime-menu'", lambda: scan_package_resources( files, '*.sublime-menu', 'Package250' ), lambda: list( sublime.find_package_resources( '*.sublime-menu', 'Package250' ) ) ),
+		( "package 'Packages/*/dir1/*.py'", lambda: scan_package_resources( files, 'Packages/*/dir1/*.py', 'Package250' ), lambda: list( sublime.find_package_resources( 'Packages/*/dir1/*.py', 'Package250' ) ) ),
+		( "regex '.*\\.sublime-syntax$'", lambda: scan_resources_regex( files, r'.*\.sublime-syntax$' ), lambda: list( sublime.find_resources_regex( r'.*\.sublime-syntax$' ) ) ),
+		( "regex 'Packages/Package250/.*\\.py$'", lambda: scan_resources_regex( files, r'Packages/Package250/.*\.py$' ), lambda: list( sublime.find_resources_regex( r'Packages/Package250/.*\.py$' ) ) ),
+		]
+	for ( label, scan, index ) in cases:
+		assert sorted( scan() ) == sorted( index() )
+		t_scan = min( timeit.repeat( scan, number=number, repeat=3 ) ) / number
+		t_index = min( timeit.repeat( index, number=number, repeat=3 ) ) / number
+		print( '%-44s %12.1f %12.1f' % ( label, t_scan * 1e6, t_index * 1e6 ) )
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,45 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_scanner
+# time per line for the modeline scanner (lib.scanner.scan(); all formats) vs the prior MODELINE_RE regexp match
+# usage: python -m bench.bench_scanner  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import re
+import timeit
+
+from lib import scanner
+
+MODELINE_RE = r'.*-\*-\s*(.+?)\s*-\*-.*'   # prior implementation (for comparison)
+
+LINE_SIZES = [ ('1KB', 1<<10), ('1MB', 1<<20), ('10MB', 10<<20) ]
+MODELINE = '// -*- mode: javascript; tab-width: 2; -*- '
+
+## line content (prefix, repeated filler)
+INPUTS = [
+	( 'none', '', 'var a=function(b){return b-1};' ),
+	( 'emacs', MODELINE, 'var a=function(b){return b-1};' ),
+	( 'minified', '', 'module.exports=function(index,next){return index.vi(next)};' ), 	# near-miss vim markers ('index', 'next', '.vi(')
+	( '-*--*-', '', '-*--*-' ), 	# empty emacs delimiter pairs
+	]
+
+def _make_line ( size, prefix, filler ):
+	line = prefix + filler * ( ( size - len( prefix ) ) // len( filler ) + 1 )
+	return line[:size]
+
+def _time_per_call ( fn, number ):
+	return min( timeit.repeat( fn, number=number, repeat=3 ) ) / number
+
+def main ( ):
+	print( '%-6s %-10s %14s %14s' % ( 'size', 'content', 'regexp (s)', 'scanner (s)' ) )
+	for ( label, size ) in LINE_SIZES:
+		for ( content, prefix, filler ) in INPUTS:
+			line = _make_line( size, prefix, filler )
+			number = max( 1, ( 10<<20 ) // size )
+			t_re = _time_per_call( lambda: re.match( MODELINE_RE, line ), number )
+			t_scan = _time_per_call( lambda: scanner.scan( line ), number )
+			print( '%-6s %-10s %14.6f %14.6f' % ( label, content, t_re, t_scan ) )
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,130 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_scenarios
+# scenario benchmarks of ModelineWorker.match_modeline(), ModelineWorker.eval_modeline(), and Preferences.load()
+# * scenarios vary file size, line length, region mode/size, modeline presence, and syntax catalog size
+# * results (time per call and view API calls per call) are written as JSON, for tracking over time
+# usage: python -m bench.bench_scenarios [--output FILE] [--quick]  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+from . import load_plugin
+from .bench_syntax_index import sublime_syntax, tmlanguage
+
+MODELINE = '# -*- mode: python; tab-width: 4; st-trim_trailing_white_space_on_save: true; coding: utf-8-unix -*-'
+
+def make_text ( n_lines, line_length, modeline_at=None ):
+	# synthetic file text; modeline_at in [ None, 'top', 'bottom' ]
+	line = ( 'x = some_function( argument ) + 1  ' * ( line_length // 36 + 1 ) )[:line_length]
+	lines = [ line ] * n_lines
+	if modeline_at == 'top': lines[0] = MODELINE
+	if modeline_at == 'bottom': lines[-1] = MODELINE
+	return '\n'.join( lines ) + '\n'
+
+def syntax_catalog ( n_syntax ):
+	# resource names of n_syntax synthetic syntax files, which are written to the (stub) packages path, so index builds read
+	#   and parse real content
+	import sublime
+	resources = [ 'Packages/Python/Python.sublime-syntax' ] + [ 'Packages/Package%d/Syntax%d.%s' % ( i // 10, i, ( 'tmLanguage', 'sublime-syntax' )[i % 2] ) for i in range( n_syntax - 1 ) ]
+	for ( i, resource ) in enumerate( resources ):
+		path = os.path.join( sublime.packages_path(), *resource.split( '/' )[1:] )
+		if os.path.exists( path ):
+			continue
+		if not os.path.isdir( os.path.dirname( path ) ):
+			os.makedirs( os.path.dirname( path ) )
+		with open( path, 'w' ) as file:
+			file.write( tmlanguage( i ) if resource.endswith( '.tmLanguage' ) else sublime_syntax( i ) )
+	return resources
+
+def measure ( fn, min_time=0.02, repeat=3 ):
+	# returns ( seconds per call [best of repeat], number of calls per timing )
+	number = 1
+	t = timeit.timeit( fn, number=number )
+	while t < min_time:
+		number *= 2 if t * 10 > min_time else 10
+		t = timeit.timeit( fn, number=number )
+	return ( min( [ t ] + timeit.repeat( fn, number=number, repeat=repeat - 1 ) ) / number, number )
+
+def api_calls_per_call ( sublime, fn ):
+	sublime.reset_api_calls()
+	fn()
+	return dict( sublime.api_calls )
+
+def main ( argv=None ):
+	parser = argparse.ArgumentParser( description='Modeline scenario benchmarks' )
+	parser.add_argument( '--output', '-o', help='JSON results file (default: stdout)' )
+	parser.add_argument( '--quick', action='store_true', help='smaller scenario matrix' )
+	args = parser.parse_args( argv )
+
+	Modeline = load_plugin()
+	import sublime
+	Worker = Modeline.ModelineWorker
+	pref = Modeline.Preferences
+	settings = sublime.load_settings( Modeline.SETTINGS_FILENAME )
+	sublime.RESOURCES = syntax_catalog( 100 )
+	pref.load()
+
+	file_lines = [ 10, 10000 ] if args.quick else [ 10, 1000, 100000 ]
+	line_lengths = [ 80, 100000 ] if args.quick else [ 80, 10000, 1000000 ]
+	region_modes = [ 'top', 'bottom', 'both' ]
+	region_sizes = [ 5 ] if args.quick else [ 1, 5, 50 ]
+	modeline_positions = [ None, 'top', 'bottom' ]
+	catalog_sizes = [ 100, 5000 ] if args.quick else [ 100, 1000, 5000, 20000 ]
+
+	results = []
+
+	# match_modeline() / eval_modeline()
+	for n_lines in file_lines:
+		for line_length in line_lengths:
+			if n_lines * line_length > 100000000: continue 	# limit synthetic files to ~100MB
+			for modeline_at in modeline_positions:
+				view = sublime.View( make_text( n_lines, line_length, modeline_at ) )
+				for region_mode in region_modes:
+					for region_size in region_sizes:
+						settings.set( 'modeline_region', region_mode )
+						settings.set( 'modeline_region_size', region_size )
+						pref.load()
+						scenario = { 'lines': n_lines, 'line_length': line_length, 'modeline': modeline_at, 'region': region_mode, 'region_size': region_size }
+						( t, number ) = measure( lambda: Worker.match_modeline( view ) )
+						results.append( dict( scenario, benchmark='match_modeline', seconds=t, number=number, api_calls=api_calls_per_call( sublime, lambda: Worker.match_modeline( view ) ) ) )
+						modelines = Worker.match_modeline( view )
+						if modelines is not None:
+							( t, number ) = measure( lambda: Worker.eval_modeline( view, modelines ) )
+							results.append( dict( scenario, benchmark='eval_modeline', seconds=t, number=number, api_calls=api_calls_per_call( sublime, lambda: Worker.eval_modeline( view, modelines ) ) ) )
+
+	# Preferences.load() (including the syntax index build)
+	for n_syntax in catalog_sizes:
+		sublime.RESOURCES = syntax_catalog( n_syntax )
+		def cold ( ):
+			Modeline.SyntaxIndex.fingerprint = None
+			Modeline.SyntaxIndex.metadata = {}
+			Modeline.persist.save_json( Modeline.SyntaxIndex.cache_file(), {} )
+			Modeline.persist.save_json( Modeline.SyntaxIndex.metadata_cache_file(), {} )
+			pref.load()
+			Modeline.SyntaxIndex.get_modes()
+		( t, number ) = measure( cold )
+		results.append( { 'benchmark': 'preferences_load', 'syntax_files': n_syntax, 'seconds': t, 'number': number } )
+
+	report = {
+		'timestamp': time.strftime( '%Y-%m-%dT%H:%M:%SZ', time.gmtime() ),
+		'python': sys.version.split()[0],
+		'platform': platform.platform(),
+		'results': results,
+		}
+	output = json.dumps( report, indent=1, sort_keys=True )
+	if args.output:
+		with open( args.output, 'w' ) as file:
+			file.write( output + '\n' )
+	else:
+		print( output )
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,54 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_scheduler
+# time until the active view is evaluated after opening many files at once (eg, from the sidebar; the last opened file is
+#   the active tab), with views processed in queue order (before) vs by priority (after)
+# usage: python -m bench.bench_scheduler [N_FILES]  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import sys
+
+from . import load_plugin
+
+TEXT = '# -*- mode: python; tab-width: 4; indent-tabs-mode: nil; -*-\n' + ''.join( 'line %d of the view text\n' % i for i in range( 2000 ) ) + '# vim: set ts=4 et:\n'
+
+def main ( n_files=300 ):
+	Modeline = load_plugin()
+	import sublime
+	settings = sublime.load_settings( Modeline.SETTINGS_FILENAME )
+	settings.set( 'modeline_region', 'both' )
+	settings.set( 'modeline_file_cache_size', 0 )
+	settings.set( 'modeline_debounce_delay', 0 )
+	settings.set( 'modeline_idle_delay', 0 )
+	Modeline.Preferences.load()
+	Worker = Modeline.ModelineWorker
+	_now = Modeline._now
+
+	applied = []
+	apply_to_views = Worker.apply_to_views
+	def recording_apply_to_views ( modeline_settings, views ):
+		applied.extend( ( view.id(), _now() ) for view in views )
+		return apply_to_views( modeline_settings, views )
+	Worker.apply_to_views = recording_apply_to_views
+
+	print( '%d files opened at once; the last opened file is the active tab' % n_files )
+	for ( label, prioritized ) in [ ( 'queue order (before)', False ), ( 'priority (after)', True ) ]:
+		views = [ sublime.View( TEXT, file_name='/tmp/file%d.py' % i ) for i in range( n_files ) ]
+		active = views[-1]
+		sublime._windows[:] = [ sublime.Window( [ active ] + views[:-1] ) ]
+		Modeline.ModelineCache.clear()
+		del applied[:]
+		Worker.waits.clear()
+		Worker.max_depth = 0
+		start = _now()
+		for view in views:
+			# on_load() of each file, in opening order
+			Worker.eval_view( view, priority=( None if prioritized else Modeline.PRIORITY_ACTIVE ) )
+		sublime.run_timeouts()
+		done = dict( applied )
+		print( '%-22s active view evaluated after %8.2f msec (%3d of %d); all views after %8.2f msec' % ( label, ( done[active.id()] - start ) * 1000, [ view_id for ( view_id, _ ) in applied ].index( active.id() ) + 1, n_files, ( max( done.values() ) - start ) * 1000 ) )
+		print( '%-22s queue: %s' % ( '', Worker.stats() ) )
+
+if __name__ == '__main__':
+	main( *[ int( arg ) for arg in sys.argv[1:] ] )
@@ -0,0 +1,44 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_startup
+# time plugin initialization (init()) with an eagerly vs lazily built syntax index
+# usage: python -m bench.bench_startup [N_SYNTAX_FILES]  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import sys
+import timeit
+
+from . import load_plugin
+
+def main ( n_syntax=5000 ):
+	Modeline = load_plugin()
+	import sublime
+	sublime.RESOURCES = [ 'Packages/Package%d/Syntax%d.%s' % ( i // 10, i, ( 'tmLanguage', 'sublime-syntax' )[i % 2] ) for i in range( n_syntax ) ]
+	SyntaxIndex = Modeline.SyntaxIndex
+
+	def reset ( ):
+		# new session, without an on-disk index
+		SyntaxIndex.fingerprint = None
+		SyntaxIndex.syntax_modes = {}
+		Modeline.persist.save_json( SyntaxIndex.cache_file(), {} )
+
+	def eager ( ):
+		# prior behavior: index built within initialization
+		reset()
+		Modeline.init()
+		SyntaxIndex.get_modes()
+		sublime.run_timeouts()
+
+	def lazy ( ):
+		reset()
+		Modeline.init()
+		sublime.run_timeouts()
+
+	print( 'init() with %d syntax files' % n_syntax )
+	for ( label, fn ) in [ ( 'eager (before)', eager ), ( 'lazy (after)', lazy ) ]:
+		t = min( timeit.repeat( fn, number=5, repeat=3 ) ) / 5
+		print( '%-20s %10.3f msec' % ( label, t * 1000 ) )
+
+if __name__ == '__main__':
+	main( *[ int( arg ) for arg in sys.argv[1:] ] )
@@ -0,0 +1,105 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### bench.bench_syntax_index
+# time building the syntax mode index from syntax file contents (name, scope, file extensions) over synthetic syntax files
+#   on disk: file names only (before), a full read (serial and thread pool), and rebuilds with per-file cached metadata
+# usage: python -m bench.bench_syntax_index [N_SYNTAX_FILES]  (from the package root directory)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import sys
+import time
+import timeit
+
+from . import load_plugin
+
+N_RULES = 40 	# nested rules per synthetic syntax file (~5 KB each)
+LOAD_LATENCY = 0.0002 	# sec; simulated per call latency of the ST3+ load_resource() (a call into the plugin host)
+
+def sublime_syntax ( i ):
+	rules = ''.join( '    - match: \'\\b(keyword%d|other%d)\\b\'\n      scope: keyword.control.lang%d\n      push: context%d\n' % ( j, j, i, j ) for j in range( N_RULES ) )
+	return '%%YAML 1.2\n---\nname: Language %d\nfile_extensions:\n  - l%d\n  - lang%d\nscope: source.lang%d\ncontexts:\n  main:\n%s' % ( i, i, i, i, rules )
+
+def tmlanguage ( i ):
+	rules = ''.join( '\t\t<dict>\n\t\t\t<key>match</key>\n\t\t\t<string>\\b(keyword%d|other%d)\\b</string>\n\t\t\t<key>name</key>\n\t\t\t<string>keyword.control.lang%d</string>\n\t\t</dict>\n' % ( j, j, i ) for j in range( N_RULES ) )
+	return ( '<?xml version="1.0" encoding="UTF-8"?>\n<plist version="1.0">\n<dict>\n\t<key>fileTypes</key>\n\t<array>\n\t\t<string>l%d</string>\n\t</array>\n'
+		'\t<key>name</key>\n\t<string>Language %d</string>\n\t<key>patterns</key>\n\t<array>\n%s\t</array>\n\t<key>scopeName</key>\n\t<string>source.lang%d</string>\n</dict>\n</plist>\n' ) % ( i, i, rules, i )
+
+def main ( n_syntax=5000 ):
+	Modeline = load_plugin()
+	import sublime
+	syntaxmeta = Modeline.syntaxmeta
+	SyntaxIndex = Modeline.SyntaxIndex
+
+	resources = []
+	size = 0
+	for i in range( n_syntax ):
+		extension = ( 'tmLanguage', 'sublime-syntax' )[i % 2]
+		resource = 'Packages/Package%d/Syntax%d.%s' % ( i // 10, i, extension )
+		path = os.path.join( sublime.packages_path(), *resource.split( '/' )[1:] )
+		if not os.path.isdir( os.path.dirname( path ) ):
+			os.makedirs( os.path.dirname( path ) )
+		text = tmlanguage( i ) if i % 2 == 0 else sublime_syntax( i )
+		with open( path, 'w' ) as file:
+			file.write( text )
+		size += len( text )
+		resources.append( resource )
+	sublime.RESOURCES = resources
+	Modeline.Preferences.load()
+
+	def file_names ( ):
+		# prior index (file names only)
+		return dict( ( os.path.splitext( os.path.basename( f ) )[0].lower(), f ) for f in Modeline.sublime.find_resources_any( SyntaxIndex.syntax_file_patterns ) )
+
+	load_resource = Modeline.sublime.load_resource
+	def slow_load_resource ( name ):
+		time.sleep( LOAD_LATENCY )
+		return load_resource( name )
+
+	def cold ( threads, latency=False ):
+		def build ( ):
+			syntaxmeta.PARSE_THREADS = syntaxmeta.IPC_PARSE_THREADS = threads
+			Modeline.sublime.load_resource = slow_load_resource if latency else load_resource
+			SyntaxIndex.metadata = {}
+			try:
+				return SyntaxIndex.scan_syntax_modes()
+			finally:
+				Modeline.sublime.load_resource = load_resource
+		return build
+
+	def warm ( ):
+		# package set changed, no syntax file changed
+		return SyntaxIndex.scan_syntax_modes()
+
+	path = os.path.join( sublime.packages_path(), 'Package0', 'Syntax1.sublime-syntax' )
+	def one_changed ( ):
+		# a saved syntax file
+		os.utime( path, None )
+		st = os.stat( path )
+		os.utime( path, ( st.st_atime, st.st_mtime + 1 ) )
+		return SyntaxIndex.scan_syntax_modes()
+
+	print( 'syntax index over %d syntax files (%.1f MB)' % ( n_syntax, size / 1e6 ) )
+	benchmarks = [
+		( 'file names (before)', file_names ),
+		( 'read, 1 thread', cold( 1 ) ),
+		( 'read, 4 threads', cold( 4 ) ),
+		( 'read, 1 thread, +%.1f msec/load' % ( LOAD_LATENCY * 1000 ), cold( 1, True ) ),
+		( 'read, 4 threads, +%.1f msec/load' % ( LOAD_LATENCY * 1000 ), cold( 4, True ) ),
+		( 'rebuild, cached', warm ),
+		( 'rebuild, 1 changed', one_changed ),
+		]
+	for ( label, fn ) in benchmarks:
+		t = min( timeit.repeat( fn, number=1, repeat=3 ) )
+		print( '%-34s %10.1f msec   (%d modes)' % ( label, t * 1000, len( fn() ) ) )
+
+	SyntaxIndex.invalidate()
+	modes = SyntaxIndex.get_modes()
+	resolve_mode = Modeline.ModelineWorker.resolve_mode
+	number = 100000
+	t = timeit.timeit( lambda: resolve_mode( 'lang123-mode' ), number=number )
+	print( '%-34s %10.3f usec   (%s => %s)' % ( 'lookup', t / number * 1e6, 'lang123-mode', modes.get( 'lang123-mode' ) ) )
+
+if __name__ == '__main__':
+	main( *[ int( arg ) for arg in sys.argv[1:] ] )
@@ -0,0 +1,205 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### (stand-in) sublime
+# minimal headless stand-in for the ST `sublime` API module (benchmark use only)
+# * module-level configuration (VERSION, PACKAGES_PATH, RESOURCES, ...) is set directly by benchmarks
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import bisect
+import fnmatch
+import atexit
+import os
+import shutil
+import tempfile
+
+VERSION = '3211'
+DATA_PATH = tempfile.mkdtemp( prefix='modeline-bench-' )
+atexit.register( shutil.rmtree, DATA_PATH, True ) 	# (ignore_errors)
+PACKAGES_PATH = os.path.join( DATA_PATH, 'Packages' )
+INSTALLED_PACKAGES_PATH = os.path.join( DATA_PATH, 'Installed Packages' )
+CACHE_PATH = os.path.join( DATA_PATH, 'Cache' )
+RESOURCES = [] 		# resource names (eg, 'Packages/Python/Python.sublime-syntax')
+
+for _path in ( PACKAGES_PATH, INSTALLED_PACKAGES_PATH, CACHE_PATH ):
+	if not os.path.isdir( _path ): os.makedirs( _path )
+
+###
+
+def version ( ): return VERSION
+def platform ( ): return 'linux'
+def arch ( ): return 'x64'
+
+def packages_path ( ): return PACKAGES_PATH
+def installed_packages_path ( ): return INSTALLED_PACKAGES_PATH
+def cache_path ( ): return CACHE_PATH
+
+def find_resources ( pattern ):
+	return [ r for r in RESOURCES if fnmatch.fnmatch( r.rsplit( '/', 1 )[-1], pattern ) ]
+
+def load_resource ( name ):
+	with open( os.path.join( DATA_PATH, name ), 'rb' ) as file:
+		return file.read().decode( 'utf-8' )
+
+###
+
+_timeouts = []
+
+def set_timeout ( callback, delay=0 ):
+	_timeouts.append( callback )
+
+def set_timeout_async ( callback, delay=0 ):
+	_timeouts.append( callback )
+
+def run_timeouts ( ):
+	# run queued (and any subsequently queued) set_timeout()/set_timeout_async() callbacks; returns the number run
+	n = 0
+	while _timeouts:
+		_timeouts.pop( 0 )()
+		n += 1
+	return n
+
+###
+
+class Settings ( object ):
+	def __init__ ( self, values=None ):
+		self._values = dict( values or {} )
+		self._on_change = {}
+	def get ( self, key, default=None ): return self._values.get( key, default )
+	def has ( self, key ): return key in self._values
+	def set ( self, key, value ):
+		self._values[key] = value
+		for callback in list( self._on_change.values() ): callback()
+	def erase ( self, key ): self._values.pop( key, None )
+	def add_on_change ( self, key, callback ): self._on_change[key] = callback
+	def clear_on_change ( self, key ): self._on_change.pop( key, None )
+
+_settings = {}
+
+def load_settings ( name ):
+	if name not in _settings: _settings[name] = Settings()
+	return _settings[name]
+
+###
+
+class Region ( object ):
+	def __init__ ( self, a, b=None ):
+		self.a = a
+		self.b = a if b is None else b
+	def begin ( self ): return min( self.a, self.b )
+	def end ( self ): return max( self.a, self.b )
+	def size ( self ): return abs( self.b - self.a )
+	def __repr__ ( self ): return 'Region(%d, %d)' % ( self.a, self.b )
+
+###
+
+## API call counters (shared by all views; see reset_api_calls())
+api_calls = {}
+
+def reset_api_calls ( ):
+	api_calls.clear()
+
+def _count ( name ):
+	api_calls[name] = api_calls.get( name, 0 ) + 1
+
+
+class View ( object ):
+	# in-memory view (text buffer + settings); counts API calls into `api_calls`
+	_next_id = 1
+
+	def __init__ ( self, text='', file_name=None, buffer_id=None ):
+		self._id = View._next_id
+		View._next_id += 1
+		self._buffer_id = self._id if buffer_id is None else buffer_id
+		self._file_name = file_name
+		self._settings = Settings()
+		self._line_endings = 'Unix'
+		self._change_count = 0
+		self._window = None
+		self.set_text( text )
+
+	def set_text ( self, text ):
+		self._text = text
+		self._line_starts = [ 0 ]
+		pos = text.find( '\n' )
+		while pos >= 0:
+			self._line_starts.append( pos + 1 )
+			pos = text.find( '\n', pos + 1 )
+		self._change_count += 1
+
+	def id ( self ): return self._id
+	def buffer_id ( self ): return self._buffer_id
+	def file_name ( self ): return self._file_name
+	def is_valid ( self ): return True
+	def is_loading ( self ): return False
+	def is_dirty ( self ): return False
+	def encoding ( self ): return 'UTF-8'
+	def window ( self ): return self._window
+	def change_count ( self ): return self._change_count
+	def settings ( self ): return self._settings
+	def line_endings ( self ): return self._line_endings
+
+	def set_line_endings ( self, line_endings ):
+		_count( 'set_line_endings' )
+		self._line_endings = { 'unix': 'Unix', 'windows': 'Windows', 'cr': 'CR' }.get( line_endings.lower(), line_endings )
+
+	def size ( self ):
+		_count( 'size' )
+		return len( self._text )
+
+	def substr ( self, x ):
+		_count( 'substr' )
+		if isinstance( x, Region ):
+			return self._text[ x.begin() : x.end() ]
+		return self._text[ x : x + 1 ]
+
+	def text_point ( self, row, col ):
+		_count( 'text_point' )
+		if row < 0: return 0
+		if row >= len( self._line_starts ): return len( self._text )
+		return min( self._line_starts[row] + col, len( self._text ) )
+
+	def rowcol ( self, point ):
+		_count( 'rowcol' )
+		row = bisect.bisect_right( self._line_starts, point ) - 1
+		return ( row, point - self._line_starts[row] )
+
+	def line ( self, x ):
+		_count( 'line' )
+		point = x.begin() if isinstance( x, Region ) else x
+		row = bisect.bisect_right( self._line_starts, point ) - 1
+		return Region( self._line_starts[row], self._line_end( row ) )
+
+	def lines ( self, region ):
+		_count( 'lines' )
+		first = bisect.bisect_right( self._line_starts, region.begin() ) - 1
+		last = bisect.bisect_right( self._line_starts, region.end() ) - 1
+		return [ Region( self._line_starts[row], self._line_end( row ) ) for row in range( first, last + 1 ) ]
+
+	def _line_end ( self, row ):
+		if row + 1 < len( self._line_starts ):
+			return self._line_starts[row + 1] - 1
+		return len( self._text )
+
+
+class Window ( object ):
+	_next_id = 1
+
+	def __init__ ( self, views=None, num_groups=1 ):
+		self._id = Window._next_id
+		Window._next_id += 1
+		self._views = list( views or [] )
+		self._num_groups = num_groups
+		for view in self._views:
+			view._window = self
+	def id ( self ): return self._id
+	def views ( self ): return self._views
+	def num_groups ( self ): return self._num_groups
+	def active_view ( self ): return self._views[0] if self._views else None
+	def active_view_in_group ( self, group ): return self._views[group] if group < len( self._views ) else None
+	def active_group ( self ): return 0
+
+_windows = []
+
+def windows ( ): return _windows
+def active_window ( ): return _windows[0] if _windows else None
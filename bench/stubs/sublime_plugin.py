@@ -0,0 +1,18 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### (stand-in) sublime_plugin
+# minimal headless stand-in for the ST `sublime_plugin` module (benchmark use only)
+
+class EventListener ( object ):
+	pass
+
+class ApplicationCommand ( object ):
+	pass
+
+class WindowCommand ( object ):
+	def __init__ ( self, window ):
+		self.window = window
+
+class TextCommand ( object ):
+	def __init__ ( self, view ):
+		self.view = view
@@ -0,0 +1,161 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.cli
+# command line modeline scanner for whole directory trees (headless; see lib.engine)
+# usage: python -m lib.cli [options] PATH...  (from the package root directory; see --help)
+# * only the first/last lines of each file are read (see lib.headtail); files are processed by a pool of worker processes
+# * output == JSON lines (one per file with a modeline, or per file with --all):
+#   { "path", "size", "mtime", "modelines": [ [ format, modeline ], ... ] | null, "settings", "line_endings", "modes" }
+# * --cache FILE == also merge the results into a modeline cache file, seeding the plugin's persistent parse result cache
+#   (ie, <ST cache directory>/Modeline/modeline-cache.json; --region, --region-size, --region-bytes, and --formats must
+#   match the plugin settings, otherwise the plugin discards the seeded entries)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import argparse
+import collections
+import fnmatch
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from . import engine
+from . import headtail
+from . import persist
+from . import scanner
+
+from . import logging
+log = logging.getLogger( __name__ )
+
+###
+
+DEFAULT_EXCLUDES = [ '.git', '.hg', '.svn', '.bzr', '_darcs', 'CVS' ]
+DEFAULT_CACHE_SIZE = 10000 	# entries (see the plugin 'modeline_file_cache_size' setting)
+CHUNK_SIZE = 256 			# files per worker task
+RACY_MTIME_WINDOW = 2 		# sec; files modified this recently aren't added to the cache file
+
+_options = None 	# (worker) scan options
+
+def _init_worker ( options ):
+	global _options
+	_options = options
+
+
+def scan_file ( path ):
+	# result record for the file at path; { 'path', 'error' } if unreadable
+	options = _options
+	for _ in range( 2 ):
+		try:
+			st = os.stat( path )
+			modelines = engine.file_modelines( path, options['region'], options['region_size'], options['formats'], options['region_bytes'] )
+			st_after = os.stat( path )
+		except ( IOError, OSError, ValueError ) as e:
+			return { 'path': path, 'error': str( e ) }
+		if ( st.st_size, st.st_mtime ) == ( st_after.st_size, st_after.st_mtime ):
+			break
+	else:
+		return { 'path': path, 'error': 'file changed while being read' }
+	record = { 'path': path, 'size': st.st_size, 'mtime': st.st_mtime, 'modelines': None }
+	if modelines is not None:
+		( settings, line_endings, modes ) = engine.modeline_settings( modelines )
+		record.update( { 'modelines': [ list( modeline ) for modeline in modelines ], 'settings': settings, 'line_endings': line_endings, 'modes': modes } )
+	return record
+
+
+def walk ( paths, excludes=DEFAULT_EXCLUDES ):
+	# absolute paths of all files within paths (files or directories); directories matching excludes are skipped
+	for path in paths:
+		path = os.path.abspath( path )
+		if not os.path.isdir( path ):
+			yield path
+			continue
+		for ( root, dirs, files ) in os.walk( path ):
+			dirs[:] = [ d for d in dirs if not any( fnmatch.fnmatch( d, pattern ) for pattern in excludes ) ]
+			for f in files:
+				yield os.path.join( root, f )
+
+
+def merge_cache ( cache_file, config, records, cache_size ):
+	# merge records (as most recently used) into cache_file (see engine.FILE_CACHE_VERSION); returns the entry count
+	entries = collections.OrderedDict()
+	cache = persist.load_json( cache_file, {} )
+	if ( cache.get( 'version' ) == engine.FILE_CACHE_VERSION ) and ( cache.get( 'config' ) == config ):
+		for entry in cache.get( 'entries', [] ):
+			entries[entry[0]] = entry
+	for record in records:
+		entries.pop( record['path'], None )
+		entries[record['path']] = [ record['path'], record['size'], record['mtime'], record['modelines'] ]
+	entries = list( entries.values() )
+	entries = entries[ max( len( entries ) - cache_size, 0 ): ]
+	persist.save_json( cache_file, { 'version': engine.FILE_CACHE_VERSION, 'config': config, 'entries': entries } )
+	return len( entries )
+
+###
+
+def parse_args ( argv=None ):
+	parser = argparse.ArgumentParser( prog='python -m lib.cli', description='Scan files (and directory trees) for modelines, writing JSON lines results.' )
+	parser.add_argument( 'paths', nargs='+', metavar='PATH', help='file or directory' )
+	parser.add_argument( '-j', '--jobs', type=int, default=multiprocessing.cpu_count(), help='worker processes (default: %(default)s)' )
+	parser.add_argument( '--region', choices=[ headtail.TOP, headtail.BOTTOM, headtail.BOTH ], default=headtail.BOTH, help='searched region (default: %(default)s)' )
+	parser.add_argument( '--region-size', type=int, default=5, help='searched region size, in lines (default: %(default)s)' )
+	parser.add_argument( '--region-bytes', type=int, default=0, help='maximum bytes read per region (default: %d)' % headtail.MAX_SPAN_BYTES )
+	parser.add_argument( '--formats', default=','.join(( scanner.EMACS, scanner.VIM, scanner.SHEBANG )), help='recognized modeline formats (default: %(default)s)' )
+	parser.add_argument( '--exclude', action='append', default=None, metavar='PATTERN', help='skip matching directories (default: %s)' % ' '.join( DEFAULT_EXCLUDES ) )
+	parser.add_argument( '--all', action='store_true', help='output a result for every file (not just those with modelines)' )
+	parser.add_argument( '-o', '--output', default=None, help='output file (default: stdout)' )
+	parser.add_argument( '--cache', default=None, metavar='FILE', help='merge results into this modeline cache file' )
+	parser.add_argument( '--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help='maximum cache file entries (default: %(default)s)' )
+	parser.add_argument( '-v', '--verbose', action='store_true', help='report invalid modeline values (on stderr)' )
+	return parser.parse_args( argv )
+
+
+def main ( argv=None ):
+	args = parse_args( argv )
+	logging.getLogger( logging._root_package_name ).setLevel( logging.WARNING if args.verbose else logging.ERROR )
+	options = { 'region': args.region, 'region_size': args.region_size, 'region_bytes': max( args.region_bytes, 0 ), 'formats': tuple( f.strip().lower() for f in args.formats.split( ',' ) if f.strip() ) }
+	paths = walk( args.paths, DEFAULT_EXCLUDES if args.exclude is None else args.exclude )
+	cached = collections.deque( maxlen=max( args.cache_size, 0 ) ) if args.cache else None
+	racy_mtime = time.time() - RACY_MTIME_WINDOW
+	counts = { 'files': 0, 'modelines': 0, 'errors': 0 }
+	start = time.time()
+
+	pool = None
+	if args.jobs > 1:
+		pool = multiprocessing.Pool( args.jobs, _init_worker, ( options, ) )
+		records = pool.imap_unordered( scan_file, paths, CHUNK_SIZE )
+	else:
+		_init_worker( options )
+		records = ( scan_file( path ) for path in paths )
+	output = open( args.output, 'w' ) if args.output else sys.stdout
+	try:
+		for record in records:
+			counts['files'] += 1
+			if 'error' in record:
+				counts['errors'] += 1
+				print( "%s: %s" % ( record['path'], record['error'] ), file=sys.stderr )
+				continue
+			if record['modelines'] is not None:
+				counts['modelines'] += 1
+			if args.all or ( record['modelines'] is not None ):
+				output.write( json.dumps( record, sort_keys=True ) + '\n' )
+			if ( cached is not None ) and ( record['mtime'] < racy_mtime ):
+				cached.append( record )
+	finally:
+		if output is not sys.stdout:
+			output.close()
+		if pool is not None:
+			pool.close()
+			pool.join()
+
+	elapsed = time.time() - start
+	summary = '%d files (%d with modelines, %d errors) in %.1f sec (%.0f files/sec)' % ( counts['files'], counts['modelines'], counts['errors'], elapsed, counts['files'] / elapsed if elapsed else 0 )
+	if cached is not None:
+		n = merge_cache( args.cache, engine.file_cache_config( options['region'], options['region_size'], options['formats'], options['region_bytes'] ), cached, max( args.cache_size, 0 ) )
+		summary += '; %d cache entries written to %s' % ( n, args.cache )
+	print( summary, file=sys.stderr )
+	return 1 if counts['errors'] else 0
+
+if __name__ == '__main__':
+	sys.exit( main() )
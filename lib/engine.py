@@ -0,0 +1,213 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.engine
+# headless modeline engine (pure python; no sublime API dependency)
+# * find_modelines() == modelines within text spans; file_modelines() == modelines of a file on disk (head/tail only)
+# * compile_modeline() == modeline => setting actions; modeline_settings() == modelines => desired settings
+# NOTE: used by the plugin (for views) and by lib.cli (for whole directory trees)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import re
+
+from . import headtail
+from . import literal
+from . import lru
+from . import scanner
+from . import timing
+
+from . import logging
+log = logging.getLogger( __name__ )
+
+###
+
+LITERAL_MEMO_SIZE = 512 	# entries (modeline option value => parsed value)
+
+## compiled modeline setting actions
+ACTION_SET = 'set' 						# ( ACTION_SET, key, value )
+ACTION_LINE_ENDINGS = 'line_endings' 	# ( ACTION_LINE_ENDINGS, None, line_endings )
+ACTION_MODE = 'mode' 					# ( ACTION_MODE, None, mode )
+
+## modeline formats, in order of application (later formats take precedence)
+MODELINE_FORMAT_ORDER = ( scanner.SHEBANG, scanner.VIM, scanner.EMACS )
+
+VIM_FILEFORMATS = { 'unix': 'unix', 'dos': 'windows', 'mac': 'CR' }
+
+## precompiled modeline option patterns
+OPTION_RE = re.compile( r'\s*(st-|sublime-text-|sublime-|sublimetext-)?([^:]+?):\s*(.+)\s*' )
+CODING_RE = re.compile( r'(?:.+-)?(unix|dos|mac)' )
+
+## persistent file parse result cache (shared by the plugin and lib.cli)
+## * { 'version': FILE_CACHE_VERSION, 'config': file_cache_config(...), 'entries': [ [ path, size, mtime, modelines ], ... ] }
+##   with entries ordered from least to most recently used
+FILE_CACHE_VERSION = 2 	# (2: the head region includes line N + 1)
+
+def file_cache_config ( region, region_size, formats, region_bytes=0 ):
+	# parse settings which cached results depend on
+	return [ region, region_size, list( formats ), region_bytes ]
+
+###
+
+_NOT_MEMOIZED = object() 	# memo sentinels
+_NOT_LITERAL = object()
+literal_memo = lru.LRUCache( LITERAL_MEMO_SIZE )
+
+def to_json_type ( v ):
+	# log.debug( '.begin' )
+	""""Convert string value to proper JSON type.
+	"""
+	## NOTE: values are parsed with a safe literal parser (never eval()'d); results are memoized (and shared, so treat as immutable)
+	value = literal_memo.get( v, _NOT_MEMOIZED )
+	if value is _NOT_MEMOIZED:
+		t = timing.clock()
+		try:
+			value = literal.parse( v )
+		except ValueError:
+			value = _NOT_LITERAL
+		literal_memo.put( v, value )
+		timing.record( 'to_json_type', t )
+	if value is _NOT_LITERAL:
+		raise ValueError("Could not convert to JSON type.")
+	return value
+
+###
+
+def find_modelines ( spans, formats=scanner.FORMATS ):
+	# ( ( format, modeline ), ... ) in order of application, or None
+	# * spans == ( begin, text ) pairs (begin == 0 for text at the start of the file); consumed lazily, stopping when all
+	#   formats have been found
+	## NOTE: scanner.scan() is a single pass, linear in text length (safe for huge single-line files)
+	found = {}
+	for ( begin, text ) in spans:
+		remaining = [ f for f in formats if f not in found ]
+		if not remaining: break
+		t = timing.clock()
+		found.update( scanner.scan( text, remaining, is_file_start=( begin == 0 ) ) )
+		timing.record( 'scan', t )
+	modelines = tuple( ( format, found[format] ) for format in MODELINE_FORMAT_ORDER if format in found )
+	return modelines or None
+
+
+def file_modelines ( path, region=headtail.BOTH, region_size=5, formats=scanner.FORMATS, region_bytes=0 ):
+	# modelines of the file at path (see find_modelines()); only the first/last region_size lines (each region limited to
+	#   region_bytes; 0 == headtail.MAX_SPAN_BYTES) are read
+	# * raises IOError/OSError for unreadable files
+	return find_modelines( headtail.head_tail_spans( path, region, region_size, region_bytes or headtail.MAX_SPAN_BYTES ), formats )
+
+###
+
+def modeline_settings ( modelines, resolve_mode=None, compiled_modelines=None ):
+	# determine the desired settings for a sequence of ( format, modeline ) pairs (later modelines take precedence)
+	# returns ( settings, line_endings, modes ); settings == { key: value }, line_endings == None if unspecified, and
+	#   modes == requested modes (in order)
+	# * resolve_mode( mode ) == syntax file for mode (or None); resolved modes are set as settings['syntax']
+	# * compiled_modelines == optional cache ( format, modeline ) => compiled actions (eg, an lru.LRUCache)
+	## NOTE: identical modelines (eg, a standard file header) are compiled once; later uses just replay the compiled actions
+	t = timing.clock()
+	settings = {}
+	line_endings = None
+	modes = []
+	for ( format, modeline ) in modelines:
+		actions = compiled_modelines.get( ( format, modeline ) ) if compiled_modelines is not None else None
+		if actions is None:
+			t_compile = timing.clock()
+			actions = compile_modeline( format, modeline )
+			if compiled_modelines is not None:
+				compiled_modelines.put( ( format, modeline ), actions )
+			timing.record( 'compile', t_compile )
+
+		for ( action, key, value ) in actions:
+			if action == ACTION_SET:
+				settings[key] = value
+			elif action == ACTION_LINE_ENDINGS:
+				line_endings = value
+			elif action == ACTION_MODE:
+				# modes are resolved at replay (the mode index may change independently of the modeline)
+				if not value:
+					continue
+				modes.append( value )
+				syntax = resolve_mode( value ) if resolve_mode is not None else None
+				if syntax is not None:
+					settings['syntax'] = syntax
+	timing.record( 'modeline_settings', t )
+	return ( settings, line_endings, modes )
+
+
+def compile_modeline ( format, modeline ):
+	# compile a modeline into a tuple of setting actions, ( ( action, key, value ), ... )
+	if format == scanner.VIM:
+		return compile_vim_modeline( modeline )
+	if format == scanner.SHEBANG:
+		return ( ( ACTION_MODE, None, modeline ), )
+	return compile_emacs_modeline( modeline )
+
+
+def compile_vim_modeline ( modeline ):
+	actions = []
+	for opt in modeline.split():
+		key, _, value = opt.partition( '=' )
+		if key in ( 'ts', 'tabstop' ):
+			try:
+				actions.append( ( ACTION_SET, 'tab_size', int(value) ) )
+			except ValueError:
+				log.warning( "invalid value for '%s' (%s); ignored", key, value )
+		elif key in ( 'et', 'expandtab' ):
+			actions.append( ( ACTION_SET, 'translate_tabs_to_spaces', True ) )
+		elif key in ( 'noet', 'noexpandtab' ):
+			actions.append( ( ACTION_SET, 'translate_tabs_to_spaces', False ) )
+		elif key in ( 'ft', 'filetype', 'syn', 'syntax' ):
+			actions.append( ( ACTION_MODE, None, value.lower() ) )
+		elif key in ( 'ff', 'fileformat' ):
+			value = VIM_FILEFORMATS.get( value )
+			if value is not None:
+				actions.append( ( ACTION_LINE_ENDINGS, None, value ) )
+	return tuple( actions )
+
+
+def compile_emacs_modeline ( modeline ):
+	actions = []
+
+	modeline = modeline.lower() 	## ?? should lower() be used
+
+	# Split into options
+	for opt in modeline.split(';'):
+		if not opt.strip():
+			# (eg, after a trailing ';')
+			continue
+		opts = OPTION_RE.match( opt )
+
+		if opts:
+			key, value = opts.group(2), opts.group(3).strip()
+
+			if opts.group(1):
+				# log.study( "settings[%s] = %s" % (key, value) )
+				try:
+					actions.append( ( ACTION_SET, key, to_json_type(value) ) )
+				except ValueError:
+					log.warning( "invalid value for '%s' (%s); ignored", key, value )
+			elif key == "coding":
+				m = CODING_RE.match( value )
+				if m:
+					value = m.group(1)
+					if value == "dos":
+						value = "windows"
+					if value == "mac":
+						value = "CR"
+					actions.append( ( ACTION_LINE_ENDINGS, None, value ) )
+			elif key == "indent-tabs-mode":
+				if value == "nil" or value == "0":
+					actions.append( ( ACTION_SET, 'translate_tabs_to_spaces', True ) )
+				else:
+					actions.append( ( ACTION_SET, 'translate_tabs_to_spaces', False ) )
+			elif key == "mode":
+				actions.append( ( ACTION_MODE, None, value ) )
+			elif key == "tab-width":
+				try:
+					actions.append( ( ACTION_SET, 'tab_size', int(value) ) )
+				except ValueError:
+					log.warning( "invalid value for '%s' (%s); ignored", key, value )
+		else:
+			# Not a 'key: value'-pair - assume it's a syntax-name
+			actions.append( ( ACTION_MODE, None, opt.strip() ) )
+
+	return tuple( actions )
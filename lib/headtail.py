@@ -0,0 +1,86 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.headtail
+# read the first and/or last lines of a file directly from disk (pure python; no sublime API dependency)
+# * larger files are memory-mapped and only the pages near their start and end are touched, so the cost is independent of
+#   file size (in contrast, locating the last lines of a view via view.rowcol()/view.text_point() indexes lines through the
+#   whole buffer)
+# * line boundaries are searched for within at most MAX_SPAN_BYTES from each end; longer lines are truncated at that limit
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import mmap
+import os
+
+from . import scanner
+
+###
+
+TOP = 'top'
+BOTTOM = 'bottom'
+BOTH = 'both'
+
+MAX_SPAN_BYTES = 64 * 1024 	# maximum bytes read at each end of the file
+
+_BOM = '\ufeff'
+
+def head_tail_spans ( path, region=BOTH, region_lines=5, max_span_bytes=MAX_SPAN_BYTES ):
+	# [ ( begin, text ), ... ] == text (decoded, with '\n' line endings) of the first/last lines of the file
+	# * spans (as file byte offsets) match the view regions used for views: the first region_lines + 1 lines (ie, through
+	#   line region_lines, 0-based), and the last region_lines lines (where the empty "line" after a final newline counts as
+	#   a line); overlapping spans are merged
+	# * raises IOError/OSError for unreadable files
+	with open( path, 'rb' ) as file:
+		size = os.fstat( file.fileno() ).st_size
+		if size == 0:
+			return [ ( 0, '' ) ]
+		if size <= 2 * max_span_bytes:
+			# small file: a single read() is cheaper than mapping
+			return _spans( file.read(), size, region, region_lines, max_span_bytes )
+		mapped = mmap.mmap( file.fileno(), 0, access=mmap.ACCESS_READ )
+		try:
+			return _spans( mapped, size, region, region_lines, max_span_bytes )
+		finally:
+			mapped.close()
+
+
+def _spans ( data, size, region, region_lines, max_span_bytes ):
+	# data == file content (bytes or mmap)
+	spans = []
+	if region != BOTTOM:
+		spans.append( ( 0, _head_end( data, size, region_lines + 1, max_span_bytes ) ) )
+	if region != TOP:
+		spans.append( ( _tail_begin( data, size, region_lines, max_span_bytes ), size ) )
+	return [ ( begin, _decode( data[begin:end], begin == 0 ) ) for ( begin, end ) in scanner.coalesce_spans( spans ) ]
+
+
+def _head_end ( data, size, n_lines, max_span_bytes ):
+	# offset just past the n_lines-th newline (or the search limit)
+	limit = min( size, max_span_bytes )
+	pos = 0
+	for _ in range( n_lines ):
+		i = data.find( b'\n', pos, limit )
+		if i < 0:
+			return limit
+		pos = i + 1
+	return pos
+
+
+def _tail_begin ( data, size, n_lines, max_span_bytes ):
+	# offset of the start of the n_lines-th line counting back from the end (or the search limit)
+	limit = max( 0, size - max_span_bytes )
+	pos = size
+	for _ in range( n_lines ):
+		i = data.rfind( b'\n', limit, pos )
+		if i < 0:
+			return limit
+		pos = i
+	return pos + 1
+
+
+def _decode ( data, is_file_start ):
+	# NOTE: spans may begin/end within a multi-byte character (at the search limits); such characters are replaced
+	text = data.decode( 'utf-8', 'replace' ).replace( '\r\n', '\n' )
+	if is_file_start and text.startswith( _BOM ):
+		text = text[len( _BOM ):]
+	return text
@@ -0,0 +1,107 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.literal
+# safe literal parser (replacement for eval() of untrusted modeline values)
+# * accepts booleans, null/none, ints, floats, quoted strings (single or double), and JSON-style lists and dicts
+# * anything else (names, expressions, calls, ...) raises ValueError
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import re
+
+try: unichr
+except NameError: unichr = chr
+
+_WHITESPACE_RE = re.compile( r'\s*' )
+_NUMBER_RE = re.compile( r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?' )
+_WORD_RE = re.compile( r'[A-Za-z_]\w*' )
+_STRING_RE = { '"': re.compile( r'"((?:[^"\\]|\\.)*)"', re.DOTALL ), "'": re.compile( r"'((?:[^'\\]|\\.)*)'", re.DOTALL ) }
+_ESCAPE_RE = re.compile( r'\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)', re.DOTALL )
+
+_WORDS = { 'true': True, 'false': False, 'null': None, 'none': None }
+_ESCAPES = { 'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', 'a': '\a', '0': '\0', '\\': '\\', '"': '"', "'": "'", '/': '/' }
+
+###
+
+def parse ( text ):
+	# parse a literal value from text; raises ValueError for anything which is not a (complete) literal
+	try:
+		( value, i ) = _parse_value( text, _skip( text, 0 ) )
+	except RuntimeError:
+		# recursion limit exceeded
+		raise ValueError( "literal nesting too deep" )
+	i = _skip( text, i )
+	if i != len( text ):
+		raise ValueError( "unexpected text at position %d" % i )
+	return value
+
+###
+
+def _skip ( text, i ):
+	return _WHITESPACE_RE.match( text, i ).end()
+
+
+def _parse_value ( text, i ):
+	if i >= len( text ):
+		raise ValueError( "unexpected end of text" )
+	c = text[i]
+	if c in _STRING_RE:
+		m = _STRING_RE[c].match( text, i )
+		if not m: raise ValueError( "unterminated string at position %d" % i )
+		return ( _ESCAPE_RE.sub( _unescape, m.group(1) ), m.end() )
+	if c == '[':
+		return _parse_sequence( text, i + 1, ']', _parse_item )
+	if c == '{':
+		return _parse_sequence( text, i + 1, '}', _parse_pair )
+	m = _NUMBER_RE.match( text, i )
+	if m:
+		number = m.group(0)
+		if ( '.' in number ) or ( 'e' in number ) or ( 'E' in number ):
+			return ( float( number ), m.end() )
+		return ( int( number ), m.end() )
+	m = _WORD_RE.match( text, i )
+	if m and ( m.group(0).lower() in _WORDS ):
+		return ( _WORDS[ m.group(0).lower() ], m.end() )
+	raise ValueError( "not a literal at position %d" % i )
+
+
+def _parse_item ( text, i, result ):
+	( value, i ) = _parse_value( text, i )
+	result.append( value )
+	return i
+
+
+def _parse_pair ( text, i, result ):
+	( key, i ) = _parse_value( text, i )
+	if isinstance( key, ( list, dict ) ):
+		raise ValueError( "invalid (unhashable) key at position %d" % i )
+	i = _skip( text, i )
+	if text[i:i+1] != ':':
+		raise ValueError( "expected ':' at position %d" % i )
+	( value, i ) = _parse_value( text, _skip( text, i + 1 ) )
+	result[key] = value
+	return i
+
+
+def _parse_sequence ( text, i, close, parse_element ):
+	# parse a list/dict body (after the opening bracket), allowing a trailing comma
+	result = {} if close == '}' else []
+	i = _skip( text, i )
+	while text[i:i+1] != close:
+		i = _skip( text, parse_element( text, i, result ) )
+		c = text[i:i+1]
+		if c == ',':
+			i = _skip( text, i + 1 )
+		elif c != close:
+			raise ValueError( "expected ',' or '%s' at position %d" % ( close, i ) )
+	return ( result, i + 1 )
+
+
+def _unescape ( m ):
+	# NOTE: unsupported escapes are rejected (rather than passed through altered), so the option is ignored
+	e = m.group(1)
+	if ( e[0] in 'ux' ) and ( len( e ) > 1 ):
+		return unichr( int( e[1:], 16 ) )
+	if e not in _ESCAPES:
+		raise ValueError( "unsupported escape '\\%s'" % e )
+	return _ESCAPES[e]
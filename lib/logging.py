@@ -23,6 +23,8 @@ DEFAULT_LOG_INFO_FORMAT = _root_package_name+': %(levelname)s: %(message)s'
 DEFAULT_LOG_NOTICE_FORMAT = _root_package_name+': %(message)s'
 DEFAULT_LOG_WARNING_FORMAT = '%(name)s:%(funcName)s():%(levelname)s: %(message)s'
 
+DEFAULT_RING_BUFFER_CAPACITY = 1000 	# records
+
 ## define new levels
 STUDY = DEBUG - 1
 TRACE = DEBUG - 1
@@ -31,15 +33,25 @@ DESIGN = NOTICE + 1
 
 # setup default parent package logging
 _log_package = getLogger( _root_package_name )
-#_log_package.handlers = []   # PORT: not documented in 'logging', but needed to stop duplicate handlers on module reloads; ? future portability issue; enable of if submodule reloading is implemented
+
+## remove handlers installed by any prior load of this module (ie, package reloads), avoiding duplicated output
+## NOTE: package handlers are tagged (via _add_package_handler()), leaving any other handlers in place
+_prior_handlers = [ h for h in _log_package.handlers if getattr( h, '_package_handler', None ) == _root_package_name ]
+for _handler in _prior_handlers:
+	_log_package.removeHandler( _handler )
+
+def _add_package_handler ( handler ):
+	handler._package_handler = _root_package_name
+	_log_package.addHandler( handler )
 
 from . import common
 
 # if 'DEBUG' not in globals() or not DEBUG:
 if not common.DEBUG:
 	_handler = StreamHandler()
+	_handler.setLevel( NOTICE ) 	# console output stays quiet; more verbose logger levels only feed the ring buffer (see below)
 	_handler.setFormatter( Formatter( DEFAULT_LOG_FORMAT ) )
-	_log_package.addHandler( _handler )
+	_add_package_handler( _handler )
 else:
 	# LevelRangeFilter
 	import sys
@@ -58,22 +70,70 @@ else:
 	_handler = StreamHandler()
 	_handler.addFilter( LevelRangeFilter(max=DEBUG) )
 	_handler.setFormatter( Formatter( DEFAULT_LOG_DEBUG_FORMAT ) )
-	_log_package.addHandler( _handler )
+	_add_package_handler( _handler )
 	#
 	_handler = StreamHandler()
 	_handler.addFilter( LevelRangeFilter(min=DEBUG+1, max=NOTICE-1) )
 	_handler.setFormatter( Formatter( DEFAULT_LOG_INFO_FORMAT ) )
-	_log_package.addHandler( _handler )
+	_add_package_handler( _handler )
 	#
 	_handler = StreamHandler()
 	_handler.addFilter( LevelRangeFilter(min=NOTICE, max=NOTICE) )
 	_handler.setFormatter( Formatter( DEFAULT_LOG_NOTICE_FORMAT ) )
-	_log_package.addHandler( _handler )
+	_add_package_handler( _handler )
 	#
 	_handler = StreamHandler()
 	_handler.addFilter( LevelRangeFilter(min=NOTICE+1) )
 	_handler.setFormatter( Formatter( DEFAULT_LOG_WARNING_FORMAT ) )
-	_log_package.addHandler( _handler )
+	_add_package_handler( _handler )
+
+## in-memory ring buffer of recent records (formatted only on demand; see ring_buffer().dump())
+import collections
+
+class RingBufferHandler ( Handler ):
+	# bounded in-memory log handler; stores unformatted records, formatting them only when dump()'ed
+	# NOTE: message arguments are formatted at dump time (so reflect the state of any mutable arguments at that time)
+	def __init__ ( self, capacity=DEFAULT_RING_BUFFER_CAPACITY ):
+		Handler.__init__( self )
+		self.records = collections.deque( maxlen=capacity )
+	def emit ( self, record ):
+		self.records.append( record )
+	def set_capacity ( self, capacity ):
+		self.acquire()
+		try:
+			if capacity != self.records.maxlen:
+				self.records = collections.deque( self.records, maxlen=capacity )
+		finally:
+			self.release()
+	def dump ( self ):
+		# NOTE: emit() (via handle()) runs with the handler lock held, possibly on another thread (eg, the ST async thread),
+		#   so the records are copied under the lock (iterating a deque while it's appended to raises RuntimeError)
+		self.acquire()
+		try:
+			records = list( self.records )
+		finally:
+			self.release()
+		formatter = self.formatter or Formatter( DEFAULT_LOG_DEBUG_FORMAT )
+		return [ formatter.format( record ) for record in records ]
+
+_ring_buffer = RingBufferHandler()
+_ring_buffer.setFormatter( Formatter( DEFAULT_LOG_DEBUG_FORMAT ) )
+for _handler in _prior_handlers:
+	if hasattr( _handler, 'records' ):
+		# keep recent history across reloads
+		_ring_buffer.records.extend( _handler.records )
+_add_package_handler( _ring_buffer )
+del _prior_handlers
+
+def ring_buffer ( ):
+	return _ring_buffer
+
+
+def level_from_name ( name, default=NOTICE ):
+	# logging level (number) for a level name (eg, 'debug', 'NOTICE') or number
+	if isinstance( name, int ): return name
+	level = getLevelName( str( name ).upper() )
+	return level if isinstance( level, int ) else default
 
 log.debug( "Finished default Logger setup for %s", _root_package_name )
 
@@ -82,14 +142,28 @@ log.debug( "Finished default Logger setup for %s", _root_package_name )
 
 # add trace point logging (for msg==None) to usual logging levels
 # URLref: http://stackoverflow.com/a/16955098/43774
-# NOTE: sys._getframe() may alternatively be used for inspect.stack()[][]
+# NOTE: only the current frame chain is used (sys._getframe()); inspect.stack() walks every frame *and* reads source files
+#   from disk. The trace point name is only determined after the level check, so disabled levels cost just the check.
+
+import sys
+try: _getframe = sys._getframe
+except AttributeError:
+	# python implementations without sys._getframe()
+	import inspect
+	def _getframe ( depth=0 ):
+		frame = inspect.currentframe().f_back
+		for _ in range( depth ): frame = frame.f_back
+		return frame
+
+def _trace_point_message ( ):
+	# "<function>()" for the caller of the logging method (ie, two frames up)
+	return "%s()" % _getframe( 2 ).f_code.co_name
 
 ## modify DEBUG logging level
 def _log_debug ( self, message=None, *args, **kws ):
 	if self.isEnabledFor( DEBUG ):
-		import inspect
 		if  message is None:
-			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+			message = _trace_point_message()
 		# _log() used instead of log() to avoid introducing another frame level for funcName, lineno purposes
 		self._log( DEBUG, message, args, **kws ) 	# _log() takes *args as args ## NOTE: NOT self.log( DEBUG, message, *args, **kws )
 
@@ -99,9 +173,8 @@ log.debug( "logging.debug() modified" )
 ## modify INFO logging level
 def _log_info ( self, message=None, *args, **kws ):
 	if self.isEnabledFor( INFO ):
-		import inspect
 		if  message is None:
-			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+			message = _trace_point_message()
 		# _log() used instead of log() to avoid introducing another frame level for funcName, lineno purposes
 		self._log( INFO, message, args, **kws ) 	# _log() takes *args as args ## NOTE: NOT self.log( INFO, message, *args, **kws )
 
@@ -111,9 +184,8 @@ log.debug( "logging.info() modified" )
 ## modify WARNING logging level
 def _log_warning ( self, message=None, *args, **kws ):
 	if self.isEnabledFor( WARNING ):
-		import inspect
 		if  message is None:
-			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+			message = _trace_point_message()
 		# _log() used instead of log() to avoid introducing another frame level for funcName, lineno purposes
 		self._log( WARNING, message, args, **kws ) 	# _log() takes *args as args ## NOTE: NOT self.log( WARNING, message, *args, **kws )
 
@@ -123,9 +195,8 @@ log.debug( "logging.warning() modified" )
 ## modify ERROR logging level
 def _log_error ( self, message=None, *args, **kws ):
 	if self.isEnabledFor( ERROR ):
-		import inspect
 		if  message is None:
-			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+			message = _trace_point_message()
 		# _log() used instead of log() to avoid introducing another frame level for funcName, lineno purposes
 		self._log( ERROR, message, args, **kws ) 	# _log() takes *args as args ## NOTE: NOT self.log( ERROR, message, *args, **kws )
 
@@ -135,9 +206,8 @@ log.debug( "logging.error() modified" )
 ## modify CRITICAL logging level
 def _log_critical ( self, message=None, *args, **kws ):
 	if self.isEnabledFor( CRITICAL ):
-		import inspect
 		if  message is None:
-			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+			message = _trace_point_message()
 		# _log() used instead of log() to avoid introducing another frame level for funcName, lineno purposes
 		self._log( CRITICAL, message, args, **kws ) 	# _log() takes *args as args ## NOTE: NOT self.log( CRITICAL, message, *args, **kws )
 
@@ -154,9 +224,8 @@ addLevelName( STUDY, 'STUDY' )
 
 def _log_study ( self, message=None, *args, **kws ):
 	if self.isEnabledFor( STUDY ):
-		import inspect
 		if  message is None:
-			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+			message = _trace_point_message()
 		# _log() used instead of log() to avoid introducing another frame level for funcName, lineno purposes
 		self._log( STUDY, message, args, **kws ) 	# _log() takes *args as args ## NOTE: NOT self.log( STUDY, message, *args, **kws )
 
@@ -169,9 +238,8 @@ addLevelName( TRACE, 'TRACE' )
 
 def _log_trace ( self, message=None, *args, **kws ):
 	if self.isEnabledFor( TRACE ):
-		import inspect
 		if  message is None:
-			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+			message = _trace_point_message()
 		# _log() used instead of log() to avoid introducing another frame level for funcName, lineno purposes
 		self._log( TRACE, message, args, **kws ) 	# _log() takes *args as args ## NOTE: NOT self.log( TRACE, message, *args, **kws )
 
@@ -184,9 +252,8 @@ addLevelName( NOTICE, 'NOTICE' )
 
 def _log_notice ( self, message=None, *args, **kws ):
 	if self.isEnabledFor( NOTICE ):
-		import inspect
 		if  message is None:
-			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+			message = _trace_point_message()
 		# _log() used instead of log() to avoid introducing another frame level for funcName, lineno purposes
 		self._log( NOTICE, message, args, **kws ) 	# _log() takes *args as args ## NOTE: NOT self.log( NOTICE, message, *args, **kws )
 
@@ -199,9 +266,8 @@ addLevelName( DESIGN, 'DESIGN' )
 
 def _log_design ( self, message=None, *args, **kws ):
 	if self.isEnabledFor( DESIGN ):
-		import inspect
 		if  message is None:
-			message = "%s()" % inspect.stack()[1][0].f_code.co_name
+			message = _trace_point_message()
 		# _log() used instead of log() to avoid introducing another frame level for funcName, lineno purposes
 		self._log( DESIGN, message, args, **kws ) 	# _log() takes *args as args ## NOTE: NOT self.log( DESIGN, message, *args, **kws )
 
@@ -0,0 +1,74 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.lru
+# bounded LRU (least recently used) cache, with hit/miss counters
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import threading
+
+try: from collections import OrderedDict
+except ImportError:
+	# python 2.6 (ST2); see LRUCache.put()
+	OrderedDict = None
+
+###
+
+class LRUCache ( object ):
+	# NOTE: thread-safe; cached values are shared between callers and should be treated as immutable
+
+	def __init__ ( self, maxsize=256 ):
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self._data = OrderedDict() if OrderedDict is not None else {}
+		self._lock = threading.Lock()
+
+	def __len__ ( self ):
+		return len( self._data )
+
+	def __contains__ ( self, key ):
+		return key in self._data
+
+	def get ( self, key, default=None ):
+		with self._lock:
+			try:
+				value = self._data.pop( key )
+			except KeyError:
+				self.misses += 1
+				return default
+			self._data[key] = value 	# (re)insert as most recently used
+			self.hits += 1
+			return value
+
+	def put ( self, key, value ):
+		with self._lock:
+			self._data.pop( key, None )
+			if len( self._data ) >= self.maxsize:
+				if OrderedDict is not None:
+					self._data.popitem( last=False ) 	# evict least recently used
+				else:
+					self._data.clear() 	# (python 2.6) no ordering available; start over
+			self._data[key] = value
+
+	def pop ( self, key, default=None ):
+		with self._lock:
+			return self._data.pop( key, default )
+
+	def clear ( self ):
+		with self._lock:
+			self._data.clear()
+
+	def keys ( self ):
+		# keys, least to most recently used
+		with self._lock:
+			return list( self._data.keys() )
+
+	def items ( self ):
+		# ( key, value ) pairs, least to most recently used (without affecting recency or hit/miss counts)
+		with self._lock:
+			return list( self._data.items() )
+
+	def stats ( self ):
+		lookups = self.hits + self.misses
+		return { 'entries': len( self._data ), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses, 'hit_rate': ( self.hits / lookups ) if lookups else 0.0 }
@@ -0,0 +1,47 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.persist
+# crash-safe persistence of JSON data (eg, for package caches)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import json
+import os
+
+from . import logging
+log = logging.getLogger( __name__ )
+
+###
+
+def load_json ( path, default=None ):
+	# load JSON data from path; returns default if the file is missing or unreadable/corrupt
+	try:
+		with open( path, 'rb' ) as file:
+			return json.loads( file.read().decode( 'utf-8' ) )
+	except ( IOError, OSError, ValueError ) as e:
+		log.debug( "unable to load '%s' (%s)", path, e )
+		return default
+
+
+def save_json ( path, data ):
+	# save JSON data to path, atomically (via write to a temporary file + rename)
+	# NOTE: a crash/interruption leaves either the prior or the new file content, never a partial file
+	directory = os.path.dirname( path )
+	if directory and not os.path.isdir( directory ):
+		os.makedirs( directory )
+	temp_path = '%s.%d.tmp' % ( path, os.getpid() )
+	with open( temp_path, 'wb' ) as file:
+		file.write( json.dumps( data, separators=(',', ':') ).encode( 'utf-8' ) )
+		file.flush()
+		os.fsync( file.fileno() )
+	_replace( temp_path, path )
+
+
+def _replace ( source, destination ):
+	try:
+		os.replace( source, destination )
+	except AttributeError:
+		# python2: os.replace() unavailable; os.rename() fails on Windows when destination exists
+		if os.name == 'nt' and os.path.exists( destination ):
+			os.remove( destination )
+		os.rename( source, destination )
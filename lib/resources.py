@@ -0,0 +1,149 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.resources
+# resource enumeration for ST versions without a native find_resources() (ie, ST2)
+# * the Packages tree is walked once per scan; directories are only re-listed when their mtime has changed (a directory
+#   mtime changes whenever an entry is added, removed, or renamed within it), otherwise the prior listing is reused
+# * .sublime-package archives are listed from their zip central directory (nothing is extracted), and only re-read when
+#   their size/mtime has changed
+# * the scan state is persisted (see lib.persist), so unchanged trees are also skipped across sessions
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import time
+import zipfile
+
+from . import logging
+log = logging.getLogger( __name__ )
+
+from . import persist
+
+###
+
+PACKAGES_DIR = 'Packages'
+ARCHIVE_EXTENSION = '.sublime-package'
+
+RACY_MTIME_WINDOW = 2 	# sec; listings of entries modified this recently aren't trusted on the next scan (coarse mtime resolution)
+
+class ResourceScanner ( object ):
+	CACHE_VERSION = 1
+
+	def __init__ ( self, packages_path, installed_packages_path=None, cache_file=None ):
+		self.packages_path = packages_path
+		self.installed_packages_path = installed_packages_path
+		self.cache_file = cache_file
+		self.dirs = None 		# { relative_dir: [ mtime, [ file, ... ], [ subdir, ... ] ] }
+		self.archives = None 	# { archive_name: [ size, mtime, [ name, ... ] ] }
+		self.stats = {}
+
+	def scan ( self ):
+		# [ resource, ... ] (eg, 'Packages/Python/Python.tmLanguage'); unpacked package files precede archive contents
+		if self.dirs is None:
+			self.load()
+		self.stats = { 'dirs_listed': 0, 'dirs_reused': 0, 'archives_read': 0, 'archives_reused': 0 }
+		self.racy_mtime = time.time() - RACY_MTIME_WINDOW
+		resources = []
+		dirs = self.scan_dirs( resources )
+		archives = self.scan_archives( resources )
+		if ( dirs != self.dirs ) or ( archives != self.archives ):
+			self.dirs = dirs
+			self.archives = archives
+			self.save()
+		## de-duplicate (unpacked files override archive files of the same name)
+		seen = set()
+		return [ r for r in resources if not ( r in seen or seen.add( r ) ) ]
+
+	def load ( self ):
+		cache = persist.load_json( self.cache_file, {} ) if self.cache_file else {}
+		if cache.get( 'version' ) == self.CACHE_VERSION:
+			self.dirs = cache['dirs']
+			self.archives = cache['archives']
+		else:
+			self.dirs = {}
+			self.archives = {}
+
+	def save ( self ):
+		if not self.cache_file: return
+		try:
+			persist.save_json( self.cache_file, { 'version': self.CACHE_VERSION, 'dirs': self.dirs, 'archives': self.archives } )
+		except ( IOError, OSError ) as e:
+			log.warning( 'unable to save resource scan cache (%s)', e )
+
+	def scan_dirs ( self, resources ):
+		dirs = {}
+		stack = [ '' ]
+		while stack:
+			rel_dir = stack.pop()
+			path = os.path.join( self.packages_path, rel_dir ) if rel_dir else self.packages_path
+			try: mtime = os.stat( path ).st_mtime
+			except OSError: continue
+			entry = self.dirs.get( rel_dir )
+			if ( entry is not None ) and ( entry[0] == mtime ):
+				self.stats['dirs_reused'] += 1
+			else:
+				self.stats['dirs_listed'] += 1
+				try: ( files, subdirs ) = _list_dir( path )
+				except OSError: continue
+				entry = [ _trusted_mtime( mtime, self.racy_mtime ), files, subdirs ]
+			dirs[rel_dir] = entry
+			if rel_dir:
+				# NOTE: files in the Packages directory itself are not part of any package, so aren't resources
+				prefix = PACKAGES_DIR + '/' + rel_dir + '/'
+				resources.extend( prefix + f for f in entry[1] )
+			stack.extend( ( rel_dir + '/' + d ) if rel_dir else d for d in reversed( entry[2] ) )
+		return dirs
+
+	def scan_archives ( self, resources ):
+		archives = {}
+		if not self.installed_packages_path: return archives
+		try: names = sorted( os.listdir( self.installed_packages_path ) )
+		except OSError: return archives
+		for name in names:
+			if not name.endswith( ARCHIVE_EXTENSION ): continue
+			path = os.path.join( self.installed_packages_path, name )
+			try: st = os.stat( path )
+			except OSError: continue
+			entry = self.archives.get( name )
+			if ( entry is not None ) and ( entry[0] == st.st_size ) and ( entry[1] == st.st_mtime ):
+				self.stats['archives_reused'] += 1
+			else:
+				self.stats['archives_read'] += 1
+				try:
+					archive = zipfile.ZipFile( path ) 	# NOTE: reads only the central directory
+					try: members = [ m for m in archive.namelist() if not m.endswith( '/' ) ]
+					finally: archive.close()
+				except ( IOError, OSError, zipfile.BadZipfile ) as e:
+					log.warning( "unable to read package archive '%s' (%s)", path, e )
+					continue
+				entry = [ st.st_size, _trusted_mtime( st.st_mtime, self.racy_mtime ), members ]
+			archives[name] = entry
+			prefix = PACKAGES_DIR + '/' + name[:-len( ARCHIVE_EXTENSION )] + '/'
+			resources.extend( prefix + m for m in entry[2] )
+		return archives
+
+###
+
+def _trusted_mtime ( mtime, racy_mtime ):
+	# mtime, or None (forcing a re-read on the next scan) if further changes could occur without changing the mtime
+	return mtime if mtime < racy_mtime else None
+
+
+def _list_dir ( path ):
+	# ( [ file, ... ], [ subdir, ... ] ), each sorted; symlinked directories are not followed (as with os.walk())
+	files = []
+	subdirs = []
+	try: scandir = os.scandir
+	except AttributeError:
+		# python2
+		for name in os.listdir( path ):
+			entry_path = os.path.join( path, name )
+			if os.path.isdir( entry_path ) and not os.path.islink( entry_path ): subdirs.append( name )
+			else: files.append( name )
+	else:
+		for entry in scandir( path ):
+			if entry.is_dir( follow_symlinks=False ): subdirs.append( entry.name )
+			else: files.append( entry.name )
+	files.sort()
+	subdirs.sort()
+	return ( files, subdirs )
@@ -0,0 +1,170 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.scanner
+# modeline scanning engine (pure python; no sublime API dependency)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+# NOTE: scanning must stay linear in the line length; minified/generated files may have multi-MB lines
+# * a cheap substring check for the delimiter is done before any other work
+# * candidates are located at C speed (see the markers NOTE below), so there is no per-character python work and no regex
+#   backtracking over the line body
+
+import re
+
+MODELINE_DELIMITER = '-*-'
+
+_DELIMITER_LENGTH = len( MODELINE_DELIMITER )
+
+## modeline formats
+EMACS = 'emacs' 		# '-*- key: value; ... -*-'
+VIM = 'vim' 			# 'vim: set key=value ... :' or 'vim: key=value ...' (also 'vi:', 'Vim:', 'ex:', and 'vim{version}:')
+SHEBANG = 'shebang' 	# '#!/path/to/interpreter' (first line of file only)
+
+FORMATS = ( EMACS, VIM, SHEBANG )
+
+## markers for in-line modeline formats
+## NOTE: candidates are located at C speed, with no python loop iteration per near-miss (eg, 'index', 'next', or '.vi(' in
+##   minified code): the emacs delimiter with str.find(), and vim markers with a single regexp search for the marker's
+##   terminating ':' (a literal prefix, which is searched for much faster than a general pattern) that is then checked,
+##   behind the ':', for '{vi|vim|Vim|ex}:' or 'vim{version}:' at the start of a line or after white space
+## NOTE: emacs delimiters that don't begin a modeline (empty pairs, '-*--*-', and delimiters with no closing delimiter on
+##   their line), along with the text up to the next delimiter, are skipped with a single anchored match; content is matched
+##   atomically ('(?=(...))\1'), so a failed match never backtracks over the line
+## NOTE: runs of '-' and '*' characters (eg, '-*--*--*-', a common separator line) are collapsed to their last delimiter with
+##   a single character class match (which sre matches in a tight loop, unlike a repeated group)
+_DELIMITER_RUN_RE = re.compile( r'[-*]*' )
+_EMACS_LINE_TEXT = r'[^\n-]*(?:-(?!\*-)[^\n-]*)*' 		# text up to the next delimiter on the line
+_EMACS_TEXT = r'[^-]*(?:-(?!\*-)[^-]*)*' 				# text up to the next delimiter
+_EMACS_SKIP_RE = re.compile( r'(?:-\*-(?:[^\S\n]*-\*-|(?=(%s))\1(?=\n))(?=(%s))\2)+' % ( _EMACS_LINE_TEXT, _EMACS_TEXT ) )
+_VIM_VERSION_MARKERS = '|'.join( r'(?<=(?<!\S)[vV]im%s%s:)' % ( comparison, r'\d' * n ) for comparison in ( '', '[<=>]' ) for n in range( 1, 5 ) )
+_VIM_MARKER_RE = re.compile( r':(?<=[imx\d]:)(?:(?<=(?<!\S)vi:)|(?<=(?<!\S)ex:)|(?<=(?<!\S)[vV]im:)|(?<=\d:)(?:%s))' % _VIM_VERSION_MARKERS )
+_VIM_SET_RE = re.compile( r'se(?:t)?\s' )
+_VIM_SET_END_RE = re.compile( r'(?<!\\):' )
+_SHEBANG_RE = re.compile( r'#!\s*(\S+)(?:\s+(.*))?' )
+_SHEBANG_ENV_ARGUMENT_RE = re.compile( r'-\S*|\w+=\S*' )
+_INTERPRETER_VERSION_RE = re.compile( r'[-.\d]+$' )
+
+###
+
+def coalesce_spans ( spans ):
+	# merge overlapping or adjacent (begin, end) spans; returns a sorted list of disjoint spans
+	result = []
+	for ( begin, end ) in sorted( spans ):
+		if result and ( begin <= result[-1][1] ):
+			if end > result[-1][1]:
+				result[-1] = ( result[-1][0], end )
+		else:
+			result.append( ( begin, end ) )
+	return result
+
+
+###
+
+def scan ( text, formats=FORMATS, is_file_start=False ):
+	# single pass scan of a text span for modelines of all requested formats
+	# returns { format: content } for the first modeline of each format found
+	# * EMACS == the text between the delimiters; VIM == the options text (space separated); SHEBANG == the interpreter name
+	# * is_file_start == text begins at the start of the file (a shebang is only recognized on the first line of a file)
+	found = {}
+	if is_file_start and ( SHEBANG in formats ) and text.startswith( '#!' ):
+		interpreter = parse_shebang( text[ : _line_end( text, 0 ) ] )
+		if interpreter is not None:
+			found[SHEBANG] = interpreter
+	## literal prefilters: the emacs cursor is a plain str.find() (so text without a delimiter costs just that), and the vim
+	##   marker search is skipped for text without any ':' (a memchr-speed check)
+	cursors = {} 	# format => next candidate position (-1 == none)
+	if EMACS in formats: cursors[EMACS] = text.find( MODELINE_DELIMITER )
+	if ( VIM in formats ) and ( ':' in text ): cursors[VIM] = _find_candidate( VIM, text, 0 )
+	pos = 0
+	line_end = -1 	# end of the line holding the current emacs candidate (reused for further candidates on the same line)
+	while True:
+		# advance any cursors behind the scan position, dropping exhausted formats
+		for f in list( cursors ):
+			if 0 <= cursors[f] < pos:
+				cursors[f] = _find_candidate( f, text, pos )
+			if cursors[f] < 0:
+				del cursors[f]
+		if not cursors:
+			break
+		f = min( cursors, key=cursors.get )
+		start = cursors[f]
+		if f == EMACS:
+			# emacs: '-*- ... -*-' (on a single line)
+			run_end = _DELIMITER_RUN_RE.match( text, start ).end()
+			last = text.rfind( MODELINE_DELIMITER, start, run_end )
+			if last > start:
+				pos = last 	# a run of delimiters (eg, '-*--*--*-') holds no modeline; its last delimiter may open one
+				continue
+			m = _EMACS_SKIP_RE.match( text, start, cursors.get( VIM, len( text ) ) ) 	# (stopping short of any vim candidate)
+			if m is not None:
+				pos = m.end()
+				continue
+			if start > line_end:
+				line_end = _line_end( text, start )
+			end = text.find( MODELINE_DELIMITER, start + _DELIMITER_LENGTH, line_end )
+			if end < 0:
+				pos = start + _DELIMITER_LENGTH 	# no closing delimiter on this line (nor any further delimiter; but there may be a vim modeline)
+				continue
+			modeline = text[ start + _DELIMITER_LENGTH : end ].strip()
+			if modeline:
+				found[EMACS] = modeline
+				del cursors[EMACS]
+			pos = end + _DELIMITER_LENGTH 	# continue after the closing delimiter (eg, for a combined emacs + vim modeline)
+		else:
+			# vim: '{vi:|vim:|Vim:|ex:}' at the start of a line or after white space (start == position of the marker's ':')
+			pos = _line_end( text, start )
+			options = parse_vim_options( text[ start + 1 : pos ] )
+			if options:
+				found[VIM] = options
+				del cursors[VIM]
+	return found
+
+
+def parse_vim_options ( text ):
+	# normalize vim modeline options text (after the 'vim:' marker) into space separated options
+	text = text.lstrip()
+	m = _VIM_SET_RE.match( text )
+	if m:
+		# 'set' form: options end at the first unescaped ':'
+		text = text[ m.end(): ]
+		m = _VIM_SET_END_RE.search( text )
+		if m is None:
+			return None
+		text = text[ : m.start() ]
+	else:
+		# options are separated by white space and/or ':'
+		text = text.replace( ':', ' ' )
+	return ' '.join( text.replace( '\\:', ':' ).split() )
+
+
+def parse_shebang ( line ):
+	# return the (version-less) interpreter name of a shebang line (eg, '#!/usr/bin/env python3' => 'python'), or None
+	m = _SHEBANG_RE.match( line )
+	if m is None:
+		return None
+	interpreter = m.group(1).replace( '\\', '/' ).rsplit( '/', 1 )[-1]
+	if interpreter == 'env':
+		# '#!/usr/bin/env [-S] [NAME=value ...] interpreter [args]'
+		interpreter = None
+		for argument in ( m.group(2) or '' ).split():
+			if not _SHEBANG_ENV_ARGUMENT_RE.match( argument ):
+				interpreter = argument.rsplit( '/', 1 )[-1]
+				break
+		if interpreter is None:
+			return None
+	interpreter = _INTERPRETER_VERSION_RE.sub( '', interpreter.lower() )
+	return interpreter or None
+
+
+def _find_candidate ( modeline_format, text, pos ):
+	# position of the next EMACS or VIM modeline candidate at or after pos (-1 == none)
+	if modeline_format == EMACS:
+		return text.find( MODELINE_DELIMITER, pos )
+	m = _VIM_MARKER_RE.search( text, pos )
+	return -1 if m is None else m.start()
+
+
+def _line_end ( text, pos ):
+	end = text.find( '\n', pos )
+	return len( text ) if end < 0 else end
@@ -12,7 +12,6 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 # import sublime
 from sublime import *
 
-import inspect
 import os
 
 from . import logging
@@ -109,68 +108,236 @@ def package_path ( package_name=_package_name ):
     # log.debug( ".begin" )
     return os.path.join( packages_path(), package_name )
 
+
+try: _cache_path = cache_path
+except NameError:
+    _cache_path = None
+
+def cache_path ( ):
+    # log.debug( ".begin" )
+    if _cache_path is not None:
+        return _cache_path()
+    else:
+        # ST2
+        return os.path.join( os.path.dirname( _packages_path() ), 'Cache' )
+
+
+def package_cache_path ( package_name=_package_name ):
+    # log.debug( ".begin" )
+    return os.path.join( cache_path(), package_name )
+
+###
+
+def package_roots ( ):
+    # log.debug( ".begin" )
+    # directories holding packages (unpacked packages and .sublime-package archives)
+    roots = [ _packages_path(), _installed_packages_path() ]
+    try:
+        # ST3+: packages shipped with ST
+        roots.append( os.path.join( os.path.dirname( executable_path() ), 'Packages' ) )
+    except NameError:
+        pass
+    return roots
+
+
+def resources_fingerprint ( resources, stamps=None ):
+    # log.debug( ".begin" )
+    # fingerprint of a resource list and of the files holding the resources (stamps == resource_stamps( resources ))
+    # NOTE: changes whenever one of the resources is added, removed, or modified (as an unpacked file at any depth, or
+    #   within its package archive); costs one stat() per unpacked resource and one per package archive
+    import hashlib
+    if stamps is None:
+        stamps = resource_stamps( resources )
+    h = hashlib.sha1()
+    for resource in resources:
+        h.update( ( '%s\0%r\n' % ( resource, stamps.get( resource ) ) ).encode( 'utf-8' ) )
+    return h.hexdigest()
+
 ###
 
 try: _find_resources = find_resources
 except NameError:
     _find_resources = None
 
+_resource_scanner = None
+RESOURCE_SCAN_CACHE_FILENAME = 'resource-scan.json'
+
+def _scan_resources ( ):
+    # log.debug( ".begin" )
+    # ST2: all resources (unpacked and within .sublime-package archives), via a single (mtime-validated) walk
+    global _resource_scanner
+    if _resource_scanner is None:
+        from . import resources
+        _resource_scanner = resources.ResourceScanner( _packages_path(), _installed_packages_path(), os.path.join( package_cache_path(), RESOURCE_SCAN_CACHE_FILENAME ) )
+    return _resource_scanner.scan()
+
+
 def find_resources ( fnmatch_pattern ):
     # log.debug( ".begin" )
+    return find_resources_any( [ fnmatch_pattern ] )
+
+
+def find_resources_any ( fnmatch_patterns ):
+    # log.debug( ".begin" )
+    # resources with basenames matching any of fnmatch_patterns, grouped by pattern (in pattern order)
+    # NOTE: ST2 resources are enumerated just once for all patterns
     import fnmatch
-    import os
-    # if hasattr(sublime, 'find_resources'):
     if _find_resources is not None:
-        for f in _find_resources( fnmatch_pattern ):
-            yield f
+        for fnmatch_pattern in fnmatch_patterns:
+            for f in _find_resources( fnmatch_pattern ):
+                yield f
     else:
         # ST2
-        for root, dirs, files in os.walk( _packages_path() ):
-            for f in files:
-                if fnmatch.fnmatch( f, fnmatch_pattern ):
-                    langfile = os.path.relpath( os.path.join(root, f), _packages_path() )
-                    yield sublime_pathform( os.path.join( packages_dir(), langfile ) )
+        matches = [ [] for _ in fnmatch_patterns ]
+        for f in _scan_resources():
+            basename = f.rsplit( '/', 1 )[-1]
+            for ( i, fnmatch_pattern ) in enumerate( fnmatch_patterns ):
+                if fnmatch.fnmatch( basename, fnmatch_pattern ):
+                    matches[i].append( f )
+                    break
+        for f_list in matches:
+            for f in f_list:
+                yield f
 
 ###
 
-_DEFAULT_MAX_CACHE_TIME = 600   # 600 sec == 10 min
-_resource_cache = []
-_resource_cache_timestamp = 0
+## indexed resource catalog
+## * all resources are indexed by package and by (package, extension), so typical lookups are dict hits
+## * the catalog is invalidated when the package set changes (as detected by package root directory mtimes, which change
+##   whenever a package directory/archive is added, removed, or replaced), rather than on a timer
+## * files added within an unpacked package don't change the root mtimes; saves under a package root invalidate the catalog
+##   explicitly (see invalidate_resource_catalog())
+
+_DEFAULT_MAX_CACHE_TIME = None  # (deprecated; catalog invalidation is change-driven)
+
+class _ResourceCatalog ( object ):
+    def __init__ ( self, resources ):
+        self.resources = resources
+        self.paths = set( resources )
+        self.by_package = {}            # package => [ resource, ... ]
+        self.by_package_extension = {}  # ( package, extension ) => [ resource, ... ]
+        for resource in resources:
+            parts = resource.split( '/', 2 )
+            package = parts[1] if len( parts ) > 2 else None
+            basename = resource.rsplit( '/', 1 )[-1]
+            extension = os.path.normcase( os.path.splitext( basename )[1] )
+            self.by_package.setdefault( package, [] ).append( resource )
+            self.by_package_extension.setdefault( ( package, extension ), [] ).append( resource )
+
+_catalog = None
+_catalog_signature = None
+
+_WILDCARD_CHARS = set( '*?[' )
+_REGEX_META_CHARS = set( '.^$*+?{}[]\\|()' )
+
+def _packages_signature ( ):
+    # log.debug( ".begin" )
+    signature = []
+    for root in package_roots():
+        try: signature.append( ( root, os.stat( root ).st_mtime ) )
+        except OSError: signature.append( ( root, None ) )
+    return tuple( signature )
+
+
+def resource_catalog ( ):
+    # log.debug( ".begin" )
+    global _catalog
+    global _catalog_signature
+    signature = _packages_signature()
+    if ( _catalog is None ) or ( signature != _catalog_signature ):
+        # log.info( "package set changed; re-reading all resources" )
+        _catalog = _ResourceCatalog( list( find_resources( '*' ) ) )
+        _catalog_signature = signature
+    return _catalog
+
+
+def invalidate_resource_catalog ( path=None ):
+    # log.debug( ".begin" )
+    # discard the catalog (if path is given, only if it's within a package root; eg, a newly saved package file)
+    global _catalog
+    if path is not None:
+        path = os.path.normcase( os.path.realpath( path ) )
+        roots = [ os.path.normcase( os.path.realpath( root ) ) for root in package_roots() ]
+        if not any( path.startswith( os.path.join( root, '' ) ) for root in roots ):
+            return
+    _catalog = None
+
 
 def _get_resources ( max_cache_time=_DEFAULT_MAX_CACHE_TIME ):
     # log.debug( ".begin" )
-    import time
-    now = time.time()
-    global _resource_cache
-    global _resource_cache_timestamp
-    if (( now - _resource_cache_timestamp ) > max_cache_time ):
-        # info( "cache expired; re-reading all resources" )
-        _resource_cache = list ( find_resources( '*' ) )
-        _resource_cache_timestamp = now
-    # log.notice( "len(_resource_cache) = %d", len(_resource_cache) )
-    return _resource_cache
+    return resource_catalog().resources
 
 
 def find_package_resources ( fnmatch_pattern, package_name=_package_name, max_cache_time=_DEFAULT_MAX_CACHE_TIME ):
     # log.debug( ".begin" )
-    import fnmatch, os
-    files = _get_resources( max_cache_time )
-    prefix = sublime_pathform( os.path.join( packages_dir(), package_name ) )
-    # log.info( "prefix = '%s'", prefix )
-    for f in files:
-        if f.startswith( prefix ):
-            if fnmatch.fnmatch( f, fnmatch_pattern ):
-                yield f
+    import fnmatch
+    catalog = resource_catalog()
+    if not ( _WILDCARD_CHARS & set( fnmatch_pattern ) ):
+        # exact resource path
+        candidates = [ fnmatch_pattern ] if fnmatch_pattern in catalog.paths else []
+    elif fnmatch_pattern.startswith( '*.' ) and not ( _WILDCARD_CHARS & set( fnmatch_pattern[2:] ) ) and ( '/' not in fnmatch_pattern ) and ( '.' not in fnmatch_pattern[2:] ):
+        # '*.ext' (a single extension; multi-dot patterns, eg, '*.sublime-menu.template', match more than the last extension)
+        return iter( catalog.by_package_extension.get( ( package_name, os.path.normcase( fnmatch_pattern[1:] ) ), [] ) )
+    else:
+        candidates = catalog.by_package.get( package_name, [] )
+    return ( f for f in candidates if f.split( '/', 2 )[1:2] == [ package_name ] and fnmatch.fnmatch( f, fnmatch_pattern ) )
 
 
 def find_resources_regex ( regex_pattern, max_cache_time=_DEFAULT_MAX_CACHE_TIME ):
     # log.debug( ".begin" )
     import re
-    files = _get_resources( max_cache_time )
+    catalog = resource_catalog()
     regex = re.compile( regex_pattern )
-    for f in files:
-        if regex.match(f):
-            yield f
+    files = catalog.resources
+    ## narrow the search to a single package when the pattern has a literal 'Packages/<package>/' prefix
+    prefix = _regex_literal_prefix( regex_pattern )
+    parts = prefix.split( '/', 2 )
+    if ( len( parts ) > 2 ) and ( parts[0] == packages_dir() ):
+        files = catalog.by_package.get( parts[1], [] )
+    return ( f for f in files if regex.match( f ) )
+
+
+def _regex_literal_prefix ( regex_pattern ):
+    # literal text which every match of regex_pattern must begin with ('' if unknown)
+    if '|' in regex_pattern:
+        return ''
+    i = 0
+    while ( i < len( regex_pattern ) ) and ( regex_pattern[i] not in _REGEX_META_CHARS ):
+        i += 1
+    if ( i < len( regex_pattern ) ) and ( regex_pattern[i] in '*?{' ):
+        i -= 1  # last literal character is optional/repeated
+    return regex_pattern[:max( i, 0 )]
+
+def resource_stamps ( resources ):
+    # log.debug( ".begin" )
+    # { resource: stamp } == change stamps ( [ source, size, mtime ], or None if not found ) of the files holding resources
+    # * source == index of the package root holding the (unpacked) resource file or the package archive; a resource
+    #   within an archive changes only with the archive
+    # NOTE: one stat() per unpacked resource, and one per package archive
+    roots = package_roots()
+    archive_stamps = {}
+    stamps = {}
+    for resource in resources:
+        parts = resource.split( '/', 2 )
+        if len( parts ) < 3:
+            stamps[resource] = None
+            continue
+        ( _, package, name ) = parts
+        try:
+            st = os.stat( os.path.join( roots[0], package, name ) )
+            stamps[resource] = [ 0, st.st_size, st.st_mtime ]
+            continue
+        except OSError:
+            pass
+        if package not in archive_stamps:
+            archive_stamps[package] = None
+            for ( i, root ) in enumerate( roots[1:], 1 ):
+                try: st = os.stat( os.path.join( root, package + '.sublime-package' ) )
+                except OSError: continue
+                archive_stamps[package] = [ i, st.st_size, st.st_mtime ]
+                break
+        stamps[resource] = archive_stamps[package]
+    return stamps
 
 ###
 
@@ -178,6 +345,12 @@ try: _load_resource = load_resource
 except NameError:
     _load_resource = None
 
+def is_load_resource_ipc ( ):
+    # log.debug( ".begin" )
+    # True if load_resource() is the native (ST3+) API, ie, each call is a blocking call into the editor process
+    return _load_resource is not None
+
+
 def load_resource ( path ):
     # log.debug( ".begin" )
     if _load_resource is not None:
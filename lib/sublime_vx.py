@@ -12,7 +12,6 @@ from __future__ import absolute_import, division, print_function
 # import sublime
 from sublime import *
 
-import inspect
 import os
 
 from . import logging
@@ -36,7 +35,7 @@ log.debug( "_package_cwd = %s", _package_cwd )
 
 _version = version
 def version ( ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     v = _version()
     if not v: v = '3000'
     assert v == str( _st_version_n )
@@ -44,7 +43,7 @@ def version ( ):
 
 
 def version_n ( ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     v_n = int( version() )
     assert v_n == _st_version_n
     return v_n
@@ -52,7 +51,7 @@ def version_n ( ):
 ###
 
 def package_name ( ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     st_vn = version_n()
     if st_vn >= 3000:
         name = __name__.split('.')[0]
@@ -64,7 +63,7 @@ def package_name ( ):
 ###
 
 def sublime_pathform ( path ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     # ST (as of build 2181) requires *NIX/MSYS style paths (using '/') in several areas (eg, for the 'syntax' view setting)
     return path.replace( "\\", "/" )
 
@@ -75,12 +74,12 @@ def sublime_pathform ( path ):
 # path == OS-form absolute paths
 
 def installed_packages_dir ( ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     return 'Installed Packages'
 
 _installed_packages_path = installed_packages_path
 def installed_packages_path ( ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     return _installed_packages_path()
 
 
@@ -89,22 +88,22 @@ def installed_package_path ( package_name=package_name() ):
 
 
 def packages_dir ( ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     return 'Packages'
 
 _packages_path = packages_path
 def packages_path ( ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     return _packages_path()
 
 
 def package_dir ( package_name=package_name() ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     return sublime_pathform( os.path.join( packages_dir(), package_name ) )
 
 
 def package_path ( package_name=package_name() ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     return os.path.join( packages_path(), package_name )
 
 ###
@@ -114,7 +113,7 @@ except NameError:
     _find_resources = None
 
 def find_resources ( fnmatch_pattern ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     import fnmatch
     import os
     # if hasattr(sublime, 'find_resources'):
@@ -136,7 +135,7 @@ _resource_cache = []
 _resource_cache_timestamp = 0
 
 def _get_resources ( max_cache_time=_DEFAULT_MAX_CACHE_TIME ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     import time
     now = time.time()
     global _resource_cache
@@ -150,7 +149,7 @@ def _get_resources ( max_cache_time=_DEFAULT_MAX_CACHE_TIME ):
 
 
 def find_package_resources ( fnmatch_pattern, package_name=package_name(), max_cache_time=_DEFAULT_MAX_CACHE_TIME ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     import fnmatch, os
     files = _get_resources( max_cache_time )
     prefix = sublime_pathform( os.path.join( packages_dir(), package_name ) )
@@ -162,7 +161,7 @@ def find_package_resources ( fnmatch_pattern, package_name=package_name(), max_c
 
 
 def find_resources_regex ( regex_pattern, max_cache_time=_DEFAULT_MAX_CACHE_TIME ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     import re
     files = _get_resources( max_cache_time )
     regex = re.compile( regex_pattern )
@@ -177,7 +176,7 @@ except NameError:
     _load_resource = None
 
 def load_resource ( path ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     # if hasattr(sublime, 'load_resource'):
     if _load_resource is not None:
         return _load_resource( path )
@@ -193,7 +192,7 @@ except NameError:
     _load_resource = None
 
 def load_binary_resource ( path ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
     if _load_binary_resource is not None:
         return _load_binary_resource( path )
     else:
@@ -206,8 +205,8 @@ def load_binary_resource ( path ):
 
 def resource_abstract_path ( path ):
     # path of file or .sublime-package which holds the resource content
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
 
 
 def is_resource_accessible ( path ):
-    log.debug( "%s()", inspect.stack()[0][0].f_code.co_name )
+    log.debug()
@@ -0,0 +1,226 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.syntaxmeta
+# syntax file metadata (name, scope, file extensions) and the mode alias table derived from it (pure python; no sublime
+#   API dependency)
+# * only top-level keys are extracted; .sublime-syntax (YAML) files are read line by line (no YAML parser needed), and
+#   .tmLanguage (plist XML) files with a single tokenizing pass
+# * alias_table() == { mode: syntax_file }, for modelines naming a syntax by file name, display name, scope, or file
+#   extension (eg, 'c++', 'sh', 'javascript')
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import re
+
+from . import logging
+log = logging.getLogger( __name__ )
+
+###
+
+PARSE_THREADS = 1 		# default worker threads for parse_resources() (ie, serial; parsing is CPU bound, so a pool is slower)
+IPC_PARSE_THREADS = 4 	# worker threads when each read is a blocking call into another process (ST3+ load_resource())
+
+SUBLIME_SYNTAX_EXTENSION = '.sublime-syntax'
+TMLANGUAGE_EXTENSION = '.tmLanguage'
+
+_YAML_KEY_RE = re.compile( r'\n(name|scope|file_extensions|hidden)[ \t]*:(?:[ \t]+(.*?))?[ \t\r]*$', re.M ) 	# (a literal first character is searched for much faster than '^')
+_YAML_ITEM_RE = re.compile( r'[ \t]*-[ \t]+(.*?)[ \t\r]*$' )
+_PLIST_TOKEN_RE = re.compile( r'<(/?)(dict|array)\s*>|<(?:dict|array)\s*/>|<key>(.*?)</key>|<string>(.*?)</string>|<string\s*/>|<(true|false)\s*/>', re.S )
+_PLIST_STRING_RE = re.compile( r'<string>(.*?)</string>', re.S )
+_XML_ENTITIES = ( ( '&lt;', '<' ), ( '&gt;', '>' ), ( '&quot;', '"' ), ( '&apos;', "'" ), ( '&amp;', '&' ) )
+
+###
+
+def syntax_metadata ( resource, text ):
+	# { 'name', 'scope', 'file_extensions', 'hidden' } for the syntax file content text (missing keys are None/[]/False)
+	if resource.endswith( TMLANGUAGE_EXTENSION ):
+		return parse_tmlanguage( text )
+	return parse_sublime_syntax( text )
+
+
+def parse_sublime_syntax ( text ):
+	# NOTE: top-level keys are found with a regex search (for keys at the start of a line), so nested content is never split
+	#   into lines
+	metadata = { 'name': None, 'scope': None, 'file_extensions': [], 'hidden': False }
+	text = '\n' + text
+	for m in _YAML_KEY_RE.finditer( text ):
+		( key, value ) = ( m.group(1), m.group(2) or '' )
+		if key == 'file_extensions':
+			if value.startswith( '[' ):
+				metadata['file_extensions'] = [ _yaml_scalar( v ) for v in _strip_yaml_comment( value ).strip( '[]' ).split( ',' ) if v.strip() ]
+			else:
+				metadata['file_extensions'] = _yaml_block_list( text, m.end() )
+		elif key in ( 'name', 'scope' ):
+			metadata[key] = _yaml_scalar( value ) or None
+		elif key == 'hidden':
+			metadata['hidden'] = _yaml_scalar( value ).lower() == 'true'
+	return metadata
+
+
+def parse_tmlanguage ( text ):
+	# NOTE: only the root <dict> is tokenized; nested containers (eg, the patterns and repository, ie, nearly all of the
+	#   file) are skipped by matching their closing tags (see _container_end())
+	metadata = { 'name': None, 'scope': None, 'file_extensions': [], 'hidden': False }
+	keys = { 'name': 'name', 'scopeName': 'scope', 'fileTypes': 'file_extensions', 'hideFromUser': 'hidden' }
+	pos = text.find( '<dict>' )
+	if pos < 0:
+		return metadata
+	pos += len( '<dict>' )
+	key = None 		# pending top-level key
+	while True:
+		m = _PLIST_TOKEN_RE.search( text, pos )
+		if m is None:
+			break
+		pos = m.end()
+		( close, container, k, string, boolean ) = m.groups()
+		if container:
+			if close:
+				# end of the root <dict>
+				break
+			end = _container_end( text, pos, container )
+			if key == 'file_extensions':
+				metadata['file_extensions'] = [ _xml_unescape( v ).strip() for v in _PLIST_STRING_RE.findall( text, pos, end ) ]
+			pos = end
+			key = None
+		elif k is not None:
+			key = keys.get( k )
+		else:
+			if key == 'hidden':
+				metadata['hidden'] = ( boolean == 'true' )
+			elif ( key is not None ) and ( key != 'file_extensions' ) and ( string is not None ):
+				metadata[key] = _xml_unescape( string ).strip() or None
+			key = None
+	return metadata
+
+###
+
+def parse_resources ( resources, load_resource, threads=None ):
+	# { resource: metadata (or None, if unreadable) } for syntax file resources; load_resource( resource ) == text
+	# * threads == worker thread count (default == PARSE_THREADS)
+	# NOTE: with threads > 1, resources are read and parsed by a pool of threads (when available; ie, not python2), so that
+	#   blocking reads overlap with parsing; only worthwhile when reads wait on I/O or IPC (see IPC_PARSE_THREADS)
+	def parse ( resource ):
+		try:
+			return syntax_metadata( resource, load_resource( resource ) )
+		except Exception as e:
+			log.debug( "unable to read syntax file '%s' (%s)", resource, e )
+			return None
+	if threads is None:
+		threads = PARSE_THREADS
+	executor = None
+	if ( threads > 1 ) and ( len( resources ) > 1 ):
+		try:
+			from concurrent import futures
+			executor = futures.ThreadPoolExecutor( max_workers=threads )
+		except ImportError:
+			# python2 (ST2)
+			pass
+	if executor is None:
+		return dict( ( resource, parse( resource ) ) for resource in resources )
+	try:
+		return dict( zip( resources, executor.map( parse, resources ) ) )
+	finally:
+		executor.shutdown( wait=True )
+
+###
+
+def alias_table ( syntaxes ):
+	# { mode: syntax_file } for syntaxes == [ ( syntax_file, metadata ), ... ] (in resource order; metadata may be None)
+	# * aliases, from lowest to highest precedence: file extension ('cpp'), scope ('c++' from 'source.c++'), display name
+	#   ('c++', 'batch-file'), and syntax file name (the original, file name only, modes)
+	# * for the derived aliases, .sublime-syntax files take precedence over .tmLanguage files, then the first syntax wins;
+	#   for file names, later syntaxes win (as do .sublime-syntax files, which are listed after .tmLanguage files)
+	# * hidden syntaxes are only aliased by file name
+	ordered = [ s for s in syntaxes if not s[0].endswith( TMLANGUAGE_EXTENSION ) ] + [ s for s in syntaxes if s[0].endswith( TMLANGUAGE_EXTENSION ) ]
+	table = {}
+	for aliases in ( _extension_aliases, _scope_aliases, _name_aliases ):
+		tier = {}
+		for ( syntax_file, metadata ) in ordered:
+			if ( metadata is None ) or metadata.get( 'hidden' ):
+				continue
+			for alias in aliases( metadata ):
+				tier.setdefault( alias, syntax_file )
+		table.update( tier )
+	for ( syntax_file, _ ) in syntaxes:
+		table[ os.path.splitext( syntax_file.rsplit( '/', 1 )[-1] )[0].lower() ] = syntax_file
+	return table
+
+
+def mode_aliases ( modes ):
+	# modes with emacs-style '<mode>-mode' aliases added (eg, 'c++-mode', 'js-mode'), without overriding existing modes
+	result = dict( ( mode + '-mode', syntax_file ) for ( mode, syntax_file ) in modes.items() if ' ' not in mode )
+	result.update( modes )
+	return result
+
+
+def _extension_aliases ( metadata ):
+	return [ e.lower().lstrip( '.' ) for e in metadata.get( 'file_extensions' ) or [] if e.lstrip( '.' ) ]
+
+
+def _scope_aliases ( metadata ):
+	# 'source.shell.bash' => 'shell.bash', 'bash'
+	scope = ( metadata.get( 'scope' ) or '' ).lower()
+	parts = scope.split( '.' )[1:]
+	if not parts:
+		return []
+	return [ '.'.join( parts ), parts[-1] ]
+
+
+def _name_aliases ( metadata ):
+	# 'Batch File' => 'batch file', 'batch-file'
+	name = ( metadata.get( 'name' ) or '' ).strip().lower()
+	if not name:
+		return []
+	return [ name, '-'.join( name.split() ) ]
+
+###
+
+def _yaml_block_list ( text, pos ):
+	# items of the (indented, '- item') block list following pos
+	items = []
+	while pos < len( text ):
+		end = text.find( '\n', pos + 1 )
+		if end < 0: end = len( text )
+		line = text[ pos : end ].lstrip( '\r\n' )
+		m = _YAML_ITEM_RE.match( line )
+		if m:
+			items.append( _yaml_scalar( m.group(1) ) )
+		elif line.strip() and not line.lstrip().startswith( '#' ):
+			break
+		pos = end
+	return items
+
+
+def _strip_yaml_comment ( value ):
+	i = value.find( ' #' )
+	return value[:i] if i >= 0 else value
+
+
+def _yaml_scalar ( value ):
+	value = value.strip()
+	if value[:1] in ( '"', "'" ):
+		end = value.find( value[0], 1 )
+		return value[ 1 : end if end > 0 else len( value ) ]
+	return _strip_yaml_comment( value ).strip()
+
+
+def _container_end ( text, pos, tag ):
+	# position just past the closing tag of the <tag> container whose content begins at pos
+	open_tag = '<' + tag + '>'
+	close_tag = '</' + tag + '>'
+	depth = 1
+	while depth > 0:
+		end = text.find( close_tag, pos )
+		if end < 0:
+			return len( text )
+		depth += text.count( open_tag, pos, end ) - 1
+		pos = end + len( close_tag )
+	return pos
+
+
+def _xml_unescape ( value ):
+	if '&' in value:
+		for ( entity, char ) in _XML_ENTITIES:
+			value = value.replace( entity, char )
+	return value
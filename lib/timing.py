@@ -0,0 +1,75 @@
+# (emacs/sublime) -*- mode:python; coding: utf-8-unix; tab-width: 4;  st-trim_trailing_white_space_on_save: true; st-ensure_newline_at_eof_on_save: true; -*-
+
+### lib.timing
+# lightweight per-phase timing instrumentation (counts, totals, and log2 histograms)
+# usage:
+#   t = timing.clock()              # None when instrumentation is disabled
+#   ...phase work...
+#   timing.record( 'phase', t )     # no-op when t is None
+# NOTE: when disabled, the cost per phase is two trivial function calls (no clock reads, no locking)
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import math
+import threading
+import time
+
+_now = getattr( time, 'perf_counter', time.time ) 	# monotonic, high resolution clock (when available)
+
+enabled = False
+
+_BUCKETS = 40 		# histogram buckets; bucket[i] == durations within [ 2**(i-1), 2**i ) usec
+
+_lock = threading.Lock()
+_phases = {} 		# phase => [ count, total, max, histogram ]
+
+###
+
+def clock ( ):
+	if not enabled: return None
+	return _now()
+
+
+def record ( phase, start ):
+	if start is None: return
+	duration = _now() - start
+	bucket = min( math.frexp( int( duration * 1e6 ) )[1], _BUCKETS - 1 ) 	# (== int.bit_length(), which python 2.6 (ST2) lacks)
+	with _lock:
+		stats = _phases.get( phase )
+		if stats is None:
+			stats = _phases[phase] = [ 0, 0.0, 0.0, [ 0 ] * _BUCKETS ]
+		stats[0] += 1
+		stats[1] += duration
+		if duration > stats[2]: stats[2] = duration
+		stats[3][bucket] += 1
+
+
+def reset ( ):
+	with _lock:
+		_phases.clear()
+
+
+def summary ( ):
+	# { phase: { count, total, p50, p95, max } } (durations in seconds)
+	# NOTE: percentiles are approximate, reported as the upper bound of the containing log2 histogram bucket (capped at max)
+	result = {}
+	with _lock:
+		for ( phase, ( count, total, maximum, histogram ) ) in _phases.items():
+			result[phase] = {
+				'count': count,
+				'total': total,
+				'p50': min( _percentile( histogram, count, 0.50 ), maximum ),
+				'p95': min( _percentile( histogram, count, 0.95 ), maximum ),
+				'max': maximum,
+				}
+	return result
+
+
+def _percentile ( histogram, count, q ):
+	target = q * count
+	cumulative = 0
+	for ( bucket, n ) in enumerate( histogram ):
+		cumulative += n
+		if cumulative >= target:
+			return ( 1 << bucket ) / 1e6
+	return ( 1 << ( len( histogram ) - 1 ) ) / 1e6